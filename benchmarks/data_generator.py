@@ -0,0 +1,143 @@
+import math
+import random
+from collections.abc import Iterator
+
+# Курсы валют в формате справочника hh.ru (количество единиц валюты за 1 рубль)
+CURRENCY_RATES = {"RUR": 1, "USD": 0.0125, "EUR": 0.0115, "KZT": 6.1, "BYR": 0.038, "UZS": 158.0}
+
+# Доли валют среди вакансий с указанной зарплатой (примерно как на hh.ru)
+CURRENCY_WEIGHTS = {"RUR": 0.92, "USD": 0.035, "EUR": 0.015, "KZT": 0.015, "BYR": 0.01, "UZS": 0.005}
+
+# Профессии с медианной зарплатой в рублях
+PROFESSIONS = [
+    ("Python-разработчик", 220000), ("Java-разработчик", 230000), ("Frontend-разработчик (React)", 200000),
+    ("Аналитик данных", 170000), ("Системный аналитик", 190000), ("DevOps-инженер", 240000),
+    ("Тестировщик", 130000), ("Менеджер проектов", 160000), ("Специалист службы поддержки", 60000),
+    ("Бухгалтер", 80000), ("Водитель-экспедитор", 90000), ("Менеджер по продажам", 75000),
+    ("Оператор call-центра", 50000), ("Дизайнер интерфейсов", 150000), ("Data Scientist", 260000),
+]
+LEVELS = [("", 1.0), ("Младший ", 0.6), ("Старший ", 1.4), ("Ведущий ", 1.7), ("Руководитель группы: ", 2.0)]
+RESPONSIBILITIES = [
+    "Разработка и поддержка сервисов", "Участие в код-ревью", "Работа с базами данных PostgreSQL",
+    "Взаимодействие с заказчиками", "Подготовка отчетности", "Оптимизация производительности",
+    "Написание автотестов", "Консультирование клиентов по телефону", "Ведение документации",
+    "Проектирование архитектуры на <highlighttext>Python</highlighttext>", "Доставка грузов по Москве и области",
+]
+COMPANY_WORDS = ["Технологии", "Системы", "Решения", "Логистика", "Финансы", "Торговый дом", "Софт", "Цифра",
+                 "Северный", "Восток", "Альфа", "Вектор", "Гранит", "Меридиан"]
+
+
+class SyntheticDataset:
+    """Класс синтетического набора вакансий в формате ответов API hh.ru.
+    Вакансия с номером 'index' всегда генерируется одинаково (при одном значении 'seed'), поэтому данные
+    не хранятся в памяти, а создаются по запросу: набор из 1 млн вакансий можно раздавать через тестовый сервер
+    и загружать в БД порциями."""
+
+    def __init__(self, size: int, seed: int = 42, per_company: int = 1000) -> None:
+        """Метод-конструктор для инициализации экземпляров класса SyntheticDataset.
+        size - количество вакансий, seed - начальное значение генератора случайных чисел,
+        per_company - количество вакансий у одной компании (не больше 2000 - ограничения hh.ru на глубину выдачи)."""
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("Количество вакансий должно быть целым положительным числом.")
+
+        self.size = size
+        self.seed = seed
+        self.per_company = min(per_company, 2000)
+        self.companies_amount = math.ceil(size / self.per_company)
+
+    @staticmethod
+    def company_id(company_number: int) -> str:
+        """Метод получения id компании (на hh.ru) по ее порядковому номеру"""
+        return str(1_000_000 + company_number)
+
+    def company_ids(self) -> list[str]:
+        """Метод получения id всех компаний набора"""
+        return [self.company_id(company_number) for company_number in range(self.companies_amount)]
+
+    def company_name(self, company_number: int) -> str:
+        """Метод получения названия компании по ее порядковому номеру"""
+        rng = random.Random(self.seed * 1_000_003 + company_number)
+        return f"ООО «{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)}-{company_number}»"
+
+    def vacancy(self, index: int) -> dict:
+        """Метод получения вакансии с номером 'index' в формате элемента "items" ответа API hh.ru"""
+        rng = random.Random(self.seed * 100_000_007 + index)
+        company_number = index // self.per_company
+        profession, median_salary = rng.choice(PROFESSIONS)
+        level, level_factor = rng.choice(LEVELS)
+        vacancy_id = str(50_000_000 + index)
+
+        # Зарплата не указана примерно у 45% вакансий, у остальных - вилка или только одна из границ
+        salary_range = None
+        if rng.random() >= 0.45:
+            currency = rng.choices(list(CURRENCY_WEIGHTS), weights=list(CURRENCY_WEIGHTS.values()))[0]
+            amount = rng.lognormvariate(math.log(median_salary * level_factor), 0.35) * CURRENCY_RATES[currency]
+            amount = round(amount, -3) if currency == "RUR" else round(amount, -1)
+            kind = rng.random()
+            salary_range = {
+                "from": int(amount * 0.85) if kind < 0.9 else None,
+                "to": int(amount * 1.15) if kind < 0.7 or kind >= 0.9 else None,
+                "currency": currency,
+                "gross": rng.random() < 0.3,
+            }
+
+        responsibility = None
+        if rng.random() >= 0.1:
+            responsibility = ". ".join(rng.sample(RESPONSIBILITIES, rng.randint(1, 3))) + "."
+
+        return {
+            "id": vacancy_id,
+            "name": f"{level}{profession}".strip(),
+            "area": {"id": "1", "name": "Москва"},
+            "salary": salary_range,
+            "salary_range": salary_range,
+            "employer": {"id": self.company_id(company_number), "name": self.company_name(company_number)},
+            "snippet": {"requirement": "Опыт работы от 1 года.", "responsibility": responsibility},
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        }
+
+    def vacancy_details(self, vacancy_id: int) -> dict | None:
+        """Метод получения подробных данных о вакансии в формате ответа API hh.ru по адресу /vacancies/{id}.
+        Возвращает None, если вакансии с таким id нет в наборе."""
+        index = int(vacancy_id) - 50_000_000
+        if not 0 <= index < self.size:
+            return None
+
+        vacancy = self.vacancy(index)
+        rng = random.Random(self.seed + index)
+        return {
+            **vacancy,
+            "description": f"<p>{vacancy['snippet']['responsibility'] or ''}</p>"
+                           "<ul><li>ДМС</li><li>Гибкий график</li></ul>",
+            "key_skills": [{"name": skill} for skill in rng.sample(["Python", "SQL", "Git", "Linux", "Excel", "1С",
+                                                                   "Английский язык", "Docker"], rng.randint(0, 4))],
+            "experience": {"id": "between1And3", "name": "От 1 года до 3 лет"},
+            "schedule": rng.choice([None, {"id": "fullDay", "name": "Полный день"},
+                                    {"id": "remote", "name": "Удаленная работа"}]),
+        }
+
+    def company_page(self, company_id: str, page: int, per_page: int) -> dict:
+        """Метод получения страницы вакансий компании в формате ответа API hh.ru по адресу /vacancies"""
+        company_number = int(company_id) - 1_000_000
+        start = company_number * self.per_company
+        found = max(min(self.per_company, self.size - start), 0) if 0 <= company_number < self.companies_amount else 0
+
+        first = start + page * per_page
+        last = start + min((page + 1) * per_page, found)
+        return {
+            "items": [self.vacancy(index) for index in range(first, last)],
+            "found": found,
+            "pages": math.ceil(found / per_page) if per_page else 0,
+            "page": page,
+            "per_page": per_page,
+        }
+
+    def currency_dictionary(self) -> dict:
+        """Метод получения справочника валют в формате ответа API hh.ru по адресу /dictionaries"""
+        return {"currency": [{"code": code, "rate": rate} for code, rate in CURRENCY_RATES.items()]}
+
+    def iter_batches(self, batch_size: int = 5000, limit: int | None = None) -> Iterator[list[dict]]:
+        """Генератор вакансий набора порциями по 'batch_size' (limit - максимальное количество вакансий)"""
+        total = min(self.size, limit) if limit else self.size
+        for start in range(0, total, batch_size):
+            yield [self.vacancy(index) for index in range(start, min(start + batch_size, total))]
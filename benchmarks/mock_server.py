@@ -0,0 +1,109 @@
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.data_generator import SyntheticDataset
+
+
+class MockHeadHunterServer:
+    """Класс локального HTTP-сервера, отвечающего как API hh.ru данными синтетического набора вакансий.
+    Поддерживаются адреса /vacancies (поиск по employer_id), /vacancies/{id} и /dictionaries.
+    Ответы содержат заголовок 'ETag': на условный запрос с 'If-None-Match' по неизменившимся данным возвращается 304.
+    Используется как контекстный менеджер: сервер запускается в фоновом потоке и останавливается при выходе."""
+
+    def __init__(self, dataset: SyntheticDataset, latency: float = 0.0) -> None:
+        """Метод-конструктор для инициализации экземпляров класса MockHeadHunterServer.
+        latency - искусственная задержка ответа (в секундах) для имитации сетевых задержек."""
+        self.dataset = dataset
+        self.latency = latency
+        self.requests_amount = 0
+        self.not_modified_amount = 0  # Количество ответов 304 на условные запросы
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+        self.__server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Базовый адрес сервера (например, http://127.0.0.1:54321)"""
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockHeadHunterServer":
+        """Метод входа в контекстный менеджер (запуск сервера)"""
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Метод выхода из контекстного менеджера (остановка сервера)"""
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _count_request(self) -> None:
+        """Увеличение счетчика запросов к серверу (защищенный метод)"""
+        with self.__lock:
+            self.requests_amount += 1
+
+    def _count_not_modified(self) -> None:
+        """Увеличение счетчика ответов 304 (защищенный метод)"""
+        with self.__lock:
+            self.not_modified_amount += 1
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Создание класса обработчика запросов, связанного с этим сервером (защищенный метод)"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Обработчик запросов к тестовому серверу"""
+            protocol_version = "HTTP/1.1"  # Соединения не закрываются после ответа (как у настоящего API)
+
+            def do_GET(self) -> None:
+                server._count_request()
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                path = url.path.rstrip("/")
+
+                if path == "/vacancies":
+                    body = server.dataset.company_page(query.get("employer_id", ["0"])[0],
+                                                       int(query.get("page", ["0"])[0]),
+                                                       int(query.get("per_page", ["20"])[0]))
+                elif path.startswith("/vacancies/"):
+                    body = server.dataset.vacancy_details(path.rsplit("/", 1)[1])
+                elif path == "/dictionaries":
+                    body = server.dataset.currency_dictionary()
+                else:
+                    body = None
+
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                etag = f'"{hashlib.sha1(content).hexdigest()}"'  # Данные набора не меняются между запросами
+
+                if self.headers.get("If-None-Match") == etag:
+                    server._count_not_modified()
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args) -> None:
+                pass  # Запросы к тестовому серверу не выводятся в консоль
+
+        return Handler
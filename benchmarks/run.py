@@ -0,0 +1,500 @@
+"""Набор замеров производительности загрузки вакансий от API, записи в БД и запросов к БД.
+
+Данные генерируются синтетически (benchmarks/data_generator.py) и раздаются локальным тестовым сервером
+(benchmarks/mock_server.py), запись и запросы выполняются в отдельной БД локального PostgreSQL
+(параметры подключения из database.ini). Результаты сохраняются в JSON-файл для сравнения между коммитами.
+
+Замеры, не зависящие от размера набора (время загрузки в зависимости от количества страниц и компаний,
+расход памяти и времени на типизированные строки результата и на форматирование строк), выполняются один раз
+и сохраняются в разделе "standalone".
+
+Запуск из корня проекта:
+    python -m benchmarks.run --sizes 10000 100000 --output results.json
+    python -m benchmarks.run --sizes 10000 --compare old_results.json
+    python -m benchmarks.run --skip load queries search memory pool --employers 10 100 1000 --per-company 100
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import psycopg2
+
+from benchmarks.data_generator import CURRENCY_RATES, SyntheticDataset
+from benchmarks.mock_server import MockHeadHunterServer
+from config import config
+from src.async_hh_api import AsyncHeadHunterAPI
+from src.db_manager import DBManager
+from src.hh_api import HeadHunterAPI
+from src.models import Vacancy
+from src.pipeline import sync_vacancies
+from src.presentation import format_vacancy
+
+# Группы замеров: по наборам размера из '--sizes' и не зависящие от размера набора
+SIZE_SECTIONS = ("fetch", "load", "queries", "search", "memory", "pool")
+STANDALONE_SECTIONS = ("pages", "employers", "rows")
+SECTIONS = SIZE_SECTIONS + STANDALONE_SECTIONS
+
+
+def measure(func: Callable, repeat: int = 3, rows: bool = True) -> dict:
+    """Функция замера длительности вызова 'func' (в секундах) по 'repeat' запускам.
+    При rows=True, если функция возвращает список или число, в результат добавляется количество строк ('rows')."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+
+    stats = {"runs": repeat,
+             "min": min(durations),
+             "median": statistics.median(durations),
+             "mean": statistics.fmean(durations),
+             "max": max(durations)}
+    if rows and isinstance(result, (list, tuple)):
+        stats["rows"] = len(result)
+    elif rows and isinstance(result, int):
+        stats["rows"] = result
+    return stats
+
+
+def log(message: str) -> None:
+    """Функция вывода хода замеров в stderr"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def get_api(api_class: type, server: MockHeadHunterServer, **kwargs):
+    """Функция создания клиента API, направленного на тестовый сервер (без ограничения частоты запросов)"""
+    api = api_class(rate_limit=1_000_000, **kwargs)
+    api.VACANCIES_URL = f"{server.url}/vacancies"
+    if hasattr(api, "DICTIONARIES_URL"):
+        api.DICTIONARIES_URL = f"{server.url}/dictionaries"
+    return api
+
+
+def benchmark_fetch(dataset: SyntheticDataset, db_name: str, params: dict, fetch_max: int, latency: float,
+                    repeat: int) -> dict:
+    """Замеры загрузки вакансий от API: последовательная и параллельная загрузка страниц,
+    асинхронный клиент, а также конвейер 'загрузка -> запись в БД' в сравнении с последовательным выполнением"""
+    company_ids = dataset.company_ids()[:max(fetch_max // dataset.per_company, 1)]
+    results = {"companies": len(company_ids)}
+
+    with MockHeadHunterServer(dataset, latency) as server:
+        for name, kwargs in (("get_vacancies_serial", {"max_workers": 1}),
+                             ("get_vacancies_threads_8", {"max_workers": 8})):
+            with get_api(HeadHunterAPI, server, **kwargs) as api:
+                log(f"  {name}")
+                results[name] = measure(lambda: api.get_vacancies(company_ids), repeat)
+
+        async_api = get_api(AsyncHeadHunterAPI, server, max_concurrency=8)
+        log("  get_vacancies_async_8")
+        results["get_vacancies_async_8"] = measure(lambda: asyncio.run(async_api.get_vacancies_async(company_ids)),
+                                                   repeat)
+
+        # Конвейер и последовательная загрузка сравниваются на пустой БД (пересоздается перед каждым замером),
+        # иначе второй замер выполнял бы обновление уже записанных вакансий
+        for name, load in (("fetch_then_insert", lambda db, api: db.insert_data_to_db(api.get_vacancies(company_ids))),
+                           ("sync_pipeline", lambda db, api: sync_vacancies(api, db, company_ids))):
+            DBManager(db_name, params).close()
+            with DBManager(db_name, params, incremental=True) as db, get_api(HeadHunterAPI, server) as api:
+                log(f"  {name}")
+                results[name] = measure(lambda: load(db, api), 1)
+
+        results["requests_to_server"] = server.requests_amount
+
+    for name in ("get_vacancies_serial", "get_vacancies_threads_8", "get_vacancies_async_8"):
+        results[name]["vacancies_per_second"] = results[name]["rows"] / results[name]["median"]
+    return results
+
+
+def benchmark_load(dataset: SyntheticDataset, db_name: str, params: dict, insert_max: int) -> dict:
+    """Замеры записи вакансий в БД: COPY, построчный INSERT (не более 'insert_max' вакансий),
+    первичная и повторная инкрементальная загрузка (upsert), пересчет зарплат по курсам валют.
+    Вакансии генерируются во время загрузки, поэтому отдельно замеряется время генерации набора,
+    а скорость загрузки приводится и без его учета ('db_rows_per_second').
+    После замеров в БД остается полный набор вакансий для замеров запросов."""
+    log("  generate")
+    results = {"generate": measure(lambda: sum(len(batch) for batch in dataset.iter_batches()), 1)}
+    generation_speed = dataset.size / results["generate"]["median"]  # Вакансий в секунду
+
+    def load(name: str, limit: int | None = None, bulk: bool = True, incremental: bool = False,
+             recreate: bool = True) -> None:
+        if recreate:
+            DBManager(db_name, params).close()  # Пересоздание БД
+        rows = min(dataset.size, limit) if limit else dataset.size
+        with DBManager(db_name, params, incremental=incremental) as db:
+            log(f"  {name}")
+            results[name] = measure(lambda: db.insert_batches_to_db(dataset.iter_batches(limit=limit), bulk), 1)
+            results[name]["rows"] = rows
+            results[name]["rows_per_second"] = rows / results[name]["median"]
+            db_duration = results[name]["median"] - rows / generation_speed
+            results[name]["db_rows_per_second"] = rows / db_duration if db_duration > 0 else None
+
+    load("insert_rows", limit=insert_max, bulk=False)
+    load("copy")
+    load("upsert_initial", incremental=True)
+    load("upsert_unchanged", incremental=True, recreate=False)
+
+    with DBManager(db_name, params, incremental=True) as db:
+        log("  update_currency_rates")
+        results["update_currency_rates"] = measure(lambda: db.update_currency_rates(CURRENCY_RATES), 1)
+    return results
+
+
+def prepare_database(dataset: SyntheticDataset, db_name: str, params: dict) -> None:
+    """Заполнение БД для замеров запросов без замеров загрузки"""
+    log("  Заполнение БД")
+    with DBManager(db_name, params) as db:
+        db.insert_batches_to_db(dataset.iter_batches())
+        db.update_currency_rates(CURRENCY_RATES)
+
+
+def benchmark_queries(db_name: str, params: dict, size: int, repeat: int) -> dict:
+    """Замеры всех методов чтения данных DBManager: без кеша результатов и с кешем (повторные запросы)"""
+    results = {}
+
+    with DBManager(db_name, params, incremental=True, cache_size=0) as db:
+        queries = {
+            "get_companies_list": db.get_companies_list,
+            "get_vacancies_list": db.get_vacancies_list,
+            "iter_vacancies_list": lambda: sum(1 for _ in db.iter_vacancies_list()),
+            "get_vacancies_page_first": lambda: db.get_vacancies_page(0, 100)[0],
+            "get_vacancies_page_deep": lambda: db.get_vacancies_page(size // 2, 100)[0],
+            "get_avg_salary": db.get_avg_salary,
+            "get_salary_stats": db.get_salary_stats,
+            "get_vacancies_list_with_higher_salary": db.get_vacancies_list_with_higher_salary,
+            "iter_vacancies_list_with_higher_salary":
+                lambda: sum(1 for _ in db.iter_vacancies_list_with_higher_salary()),
+            "get_vacancies_list_by_keyword": lambda: db.get_vacancies_list_by_keyword("python"),
+            "get_vacancies_list_by_keyword_page": lambda: db.get_vacancies_list_by_keyword("менеджер продажам", 20),
+            "get_vacancy_ids_to_enrich": lambda: db.get_vacancy_ids_to_enrich(1000),
+            "get_salary_trend": lambda: db.get_salary_trend("разработчик"),
+            "get_openings_by_company": db.get_openings_by_company,
+            "get_time_to_close": db.get_time_to_close,
+        }
+        for name, query in queries.items():
+            log(f"  {name}")
+            results[name] = measure(query, repeat, rows=not name.startswith("get_avg_salary"))
+
+    with DBManager(db_name, params, incremental=True) as db:
+        cached_queries = {
+            "get_companies_list_cached": db.get_companies_list,
+            "get_avg_salary_cached": db.get_avg_salary,
+            # Кешируются только результаты не больше 'cache_max_rows' строк, поэтому замеряется страница поиска
+            "get_vacancies_list_by_keyword_page_cached": lambda: db.get_vacancies_list_by_keyword("python", 20),
+        }
+        for name, query in cached_queries.items():
+            query()  # Первый запрос сохраняет результат в кеш
+            results[name] = measure(query, repeat, rows=not name.startswith("get_avg_salary"))
+        results["cache_info"] = db.cache_info()
+
+    return results
+
+
+def benchmark_search(db_name: str, params: dict, repeat: int, limit: int = 20,
+                     keywords: tuple[str, ...] = ("python", "разработчик", "менеджер продажам")) -> dict:
+    """Замеры получения первой страницы ('limit' вакансий) поиска по ключевому слову:
+    поиск методом DBManager.iter_vacancies_list_by_keyword (полнотекстовый поиск по индексу GIN с сортировкой
+    по релевантности всех найденных вакансий и, при наличии pg_trgm, поиском подстроки в названии)
+    в сравнении с прежним поиском ILIKE по названию и описанию (полный просмотр таблицы) с той же страницей.
+    Ключевые слова выбраны с разным количеством найденных вакансий (оно сохраняется в 'matches'):
+    сортировка по релевантности выполняется для всех найденных вакансий, а не только для выводимой страницы."""
+    ilike_query = """
+        SELECT vacancy.id, vacancy.source, vacancy.company_name, vacancy.title,
+            vacancy.salary_from, vacancy.salary_to, vacancy.currency, vacancy.vacancy_url
+        FROM vacancy
+        WHERE NOT vacancy.is_archived AND (vacancy.title ILIKE %(pattern)s OR vacancy.description ILIKE %(pattern)s)
+        ORDER BY vacancy.salary_from DESC NULLS LAST
+        LIMIT %(limit)s
+    """
+    count_query = """
+        SELECT COUNT(*) FROM vacancy
+        WHERE NOT is_archived
+            AND search_vector @@ (to_tsquery('russian', %(query)s) || to_tsquery('english', %(query)s))
+    """
+    results = {}
+    conn = psycopg2.connect(dbname=db_name, **params)
+    try:
+        with DBManager(db_name, params, incremental=True, cache_size=0) as db, conn.cursor() as cur:
+            results["trigram_search"] = db.trigram_search
+            for keyword in keywords:
+                name = keyword.replace(" ", "_")
+
+                def run_ilike() -> int:
+                    cur.execute(ilike_query, {"pattern": db._like_pattern(keyword), "limit": limit})
+                    return len(cur.fetchall())
+
+                log(f"  ilike_page_{name}")
+                results[f"ilike_page_{name}"] = measure(run_ilike, repeat)
+
+                log(f"  full_text_page_{name}")
+                results[f"full_text_page_{name}"] = measure(
+                    lambda: sum(1 for _ in db.iter_vacancies_list_by_keyword(keyword, limit=limit)), repeat)
+                cur.execute(count_query, {"query": db._to_tsquery(keyword)})
+                results[f"full_text_page_{name}"]["matches"] = cur.fetchone()[0]
+    finally:
+        conn.close()
+    return results
+
+
+def benchmark_memory(db_name: str, params: dict) -> dict:
+    """Замеры пикового расхода памяти (в байтах) при получении всех вакансий списком и при потоковом чтении"""
+    results = {}
+    with DBManager(db_name, params, incremental=True, cache_size=0) as db:
+        for name, query in (("get_vacancies_list", lambda: len(db.get_vacancies_list())),
+                            ("iter_vacancies_list", lambda: sum(1 for _ in db.iter_vacancies_list()))):
+            log(f"  {name}")
+            tracemalloc.start()
+            try:
+                rows = query()
+                results[name] = {"rows": rows, "peak_bytes": tracemalloc.get_traced_memory()[1]}
+            finally:
+                tracemalloc.stop()
+    return results
+
+
+def benchmark_pool(db_name: str, params: dict, repeat: int, queries: int = 200) -> dict:
+    """Замеры задержки короткого запроса с новым подключением к БД на каждый запрос (как до появления пула)
+    и с соединением из пула DBManager, а также с пулом из 5 соединений при 8 одновременных потоках
+    (лишние потоки ждут освобождения соединения). В результат добавляется задержка одного запроса в мс."""
+    query = "SELECT COUNT(*) FROM company"
+
+    def without_pool() -> int:
+        for _ in range(queries):
+            conn = psycopg2.connect(dbname=db_name, **params)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(query)
+                    cur.fetchone()
+            finally:
+                conn.close()
+        return queries
+
+    results = {}
+    with DBManager(db_name, params, incremental=True, max_connections=5, cache_size=0) as db:
+        def run_queries(amount: int) -> int:
+            for _ in range(amount):
+                with db._connection() as conn, conn, conn.cursor() as cur:
+                    cur.execute(query)
+                    cur.fetchone()
+            return amount
+
+        def with_pool_threads() -> int:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                return sum(executor.map(run_queries, [queries // 8] * 8))
+
+        for name, func in (("without_pool", without_pool), ("with_pool", lambda: run_queries(queries)),
+                           ("with_pool_8_threads", with_pool_threads)):
+            log(f"  {name}")
+            results[name] = measure(func, repeat)
+            results[name]["per_query_ms"] = results[name]["median"] / results[name]["rows"] * 1000
+
+    return results
+
+
+def benchmark_pages(page_counts: list[int], seed: int, latency: float, repeat: int, per_page: int = 100) -> dict:
+    """Замеры времени загрузки вакансий одной компании в зависимости от количества страниц выдачи:
+    последовательная загрузка страниц и параллельная (8 потоков)"""
+    results = {}
+    for pages in page_counts:
+        dataset = SyntheticDataset(pages * per_page, seed=seed, per_company=pages * per_page)
+        company_ids = dataset.company_ids()  # Одна компания с 'pages' страницами выдачи
+        with MockHeadHunterServer(dataset, latency) as server:
+            for name, max_workers in (("serial", 1), ("threads_8", 8)):
+                with get_api(HeadHunterAPI, server, max_workers=max_workers) as api:
+                    log(f"  {name}_{pages}_pages")
+                    results[f"{name}_{pages}_pages"] = measure(lambda: api.get_vacancies(company_ids, per_page),
+                                                               repeat)
+                    results[f"{name}_{pages}_pages"]["pages"] = pages
+    return results
+
+
+def benchmark_employers(employer_counts: list[int], per_company: int, seed: int, latency: float,
+                        repeat: int) -> dict:
+    """Замеры скорости загрузки вакансий в зависимости от количества компаний ('per_company' вакансий у каждой):
+    клиент на основе requests (8 потоков) в сравнении с асинхронным клиентом (8 одновременных запросов)"""
+    results = {}
+    for employers in employer_counts:
+        dataset = SyntheticDataset(employers * per_company, seed=seed, per_company=per_company)
+        company_ids = dataset.company_ids()
+        with MockHeadHunterServer(dataset, latency) as server:
+            with get_api(HeadHunterAPI, server, max_workers=8) as api:
+                log(f"  threads_8_{employers}_employers")
+                results[f"threads_8_{employers}_employers"] = measure(lambda: api.get_vacancies(company_ids), repeat)
+
+            async_api = get_api(AsyncHeadHunterAPI, server, max_concurrency=8)
+            log(f"  async_8_{employers}_employers")
+            results[f"async_8_{employers}_employers"] = measure(
+                lambda: asyncio.run(async_api.get_vacancies_async(company_ids)), repeat)
+
+        for name in (f"threads_8_{employers}_employers", f"async_8_{employers}_employers"):
+            results[name]["employers"] = employers
+            results[name]["vacancies_per_second"] = results[name]["rows"] / results[name]["median"]
+    return results
+
+
+def benchmark_rows(rows: int, seed: int, repeat: int) -> dict:
+    """Замеры времени и пикового расхода памяти (в байтах) на преобразование строк результата SQL-запроса:
+    построение строки для вывода по каждой строке результата (как до появления типизированных результатов)
+    в сравнении с созданием объектов Vacancy и с форматированием только выводимой страницы (20 вакансий).
+    Строки результата генерируются в памяти, поэтому замеряется только их преобразование."""
+    dataset = SyntheticDataset(rows, seed=seed)
+    result_rows = []
+    for index in range(rows):
+        vacancy = dataset.vacancy(index)
+        salary_range = vacancy["salary_range"] or {}
+        result_rows.append((index + 1, "hh", vacancy["employer"]["name"], vacancy["name"], salary_range.get("from"),
+                            salary_range.get("to"), salary_range.get("currency"), vacancy["alternate_url"]))
+
+    def string_rows() -> list[str]:
+        return [f"Название компании: {row[2]}.\n"
+                f"Требуется: {row[3]}.\n"
+                f"Зарплата от {row[4] if row[4] else 0} до {row[5] if row[5] else 0} {row[6]}.\n"
+                f"Ссылка на вакансию: {row[7]}.\n" for row in result_rows]
+
+    def typed_rows() -> list[Vacancy]:
+        return [Vacancy._make(row) for row in result_rows]
+
+    def typed_rows_format_page() -> list[Vacancy]:
+        vacancies = typed_rows()
+        for vacancy in vacancies[:20]:
+            format_vacancy(vacancy)
+        return vacancies
+
+    results = {}
+    for name, func in (("string_rows", string_rows), ("typed_rows", typed_rows),
+                       ("typed_rows_format_page", typed_rows_format_page)):
+        log(f"  {name}")
+        results[name] = measure(func, repeat)
+        tracemalloc.start()
+        try:
+            func()
+            results[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return results
+
+
+def get_environment(params: dict) -> dict:
+    """Функция получения сведений об окружении замеров (коммит, версии Python и PostgreSQL)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    conn = psycopg2.connect(dbname="postgres", **params)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SHOW server_version")
+            postgres_version = cur.fetchone()[0]
+    finally:
+        conn.close()
+
+    return {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgresql": postgres_version}
+
+
+def compare_results(old: dict, new: dict) -> None:
+    """Функция вывода в stderr изменения медианной длительности замеров относительно прежних результатов"""
+    for size, sections in new["results"].items():
+        for section, results in sections.items():
+            for name, stats in results.items():
+                old_stats = old.get("results", {}).get(size, {}).get(section, {}).get(name)
+                if isinstance(stats, dict) and "median" in stats and old_stats and old_stats.get("median"):
+                    ratio = stats["median"] / old_stats["median"]
+                    log(f"{size:>8} {section}.{name}: {old_stats['median']:.4f} с -> {stats['median']:.4f} с "
+                        f"({ratio:.2f}x)")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """Функция разбора аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Замеры производительности на синтетических данных hh.ru.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="количество вакансий (по умолчанию 10000)")
+    parser.add_argument("--per-company", type=int, default=1000,
+                        help="количество вакансий у одной компании (не больше 2000)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 20],
+                        help="количество страниц выдачи одной компании в замерах 'pages' (не больше 20)")
+    parser.add_argument("--employers", type=int, nargs="+", default=[10, 100, 1000],
+                        help="количество компаний в замерах 'employers' (вакансий у каждой - '--per-company')")
+    parser.add_argument("--rows", type=int, default=100_000, help="количество строк результата в замерах 'rows'")
+    parser.add_argument("--seed", type=int, default=42, help="начальное значение генератора данных")
+    parser.add_argument("--repeat", type=int, default=3, help="количество повторов каждого замера запросов")
+    parser.add_argument("--db-name", default="hh_benchmark", help="название БД для замеров (пересоздается!)")
+    parser.add_argument("--db-config", default="database.ini", help="файл с параметрами подключения к PostgreSQL")
+    parser.add_argument("--latency-ms", type=float, default=20, help="задержка ответа тестового сервера API")
+    parser.add_argument("--fetch-max", type=int, default=20000,
+                        help="максимальное количество вакансий в замерах API")
+    parser.add_argument("--insert-max", type=int, default=20000,
+                        help="максимальное количество вакансий при построчном INSERT")
+    parser.add_argument("--skip", nargs="+", choices=SECTIONS, default=[], help="пропустить группы замеров")
+    parser.add_argument("--output", default="benchmark_results.json", help="файл для сохранения результатов")
+    parser.add_argument("--compare", metavar="FILE", help="файл с прежними результатами для сравнения")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    """Функция запуска всех замеров и сохранения результатов в JSON-файл"""
+    args = parse_args(argv)
+    params = config(args.db_config)
+    report = {"environment": get_environment(params), "settings": vars(args), "results": {}}
+
+    for size in args.sizes:
+        log(f"Набор из {size} вакансий")
+        dataset = SyntheticDataset(size, seed=args.seed, per_company=args.per_company)
+        results = report["results"][str(size)] = {}
+
+        # Запросы выполняются к данным, записанным при замерах загрузки
+        if "fetch" not in args.skip:
+            results["fetch"] = benchmark_fetch(dataset, args.db_name, params, args.fetch_max,
+                                               args.latency_ms / 1000, args.repeat)
+        if "load" not in args.skip:
+            results["load"] = benchmark_load(dataset, args.db_name, params, args.insert_max)
+        elif any(section not in args.skip for section in ("queries", "search", "memory", "pool")):
+            prepare_database(dataset, args.db_name, params)
+        if "queries" not in args.skip:
+            results["queries"] = benchmark_queries(args.db_name, params, size, args.repeat)
+        if "search" not in args.skip:
+            results["search"] = benchmark_search(args.db_name, params, args.repeat)
+        if "memory" not in args.skip:
+            results["memory"] = benchmark_memory(args.db_name, params)
+        if "pool" not in args.skip:
+            results["pool"] = benchmark_pool(args.db_name, params, args.repeat)
+
+    standalone = {}
+    if "pages" not in args.skip:
+        log("Загрузка в зависимости от количества страниц")
+        standalone["pages"] = benchmark_pages(args.pages, args.seed, args.latency_ms / 1000, args.repeat)
+    if "employers" not in args.skip:
+        log("Загрузка в зависимости от количества компаний")
+        standalone["employers"] = benchmark_employers(args.employers, args.per_company, args.seed,
+                                                      args.latency_ms / 1000, args.repeat)
+    if "rows" not in args.skip:
+        log(f"Типизированные строки и форматирование строк ({args.rows} строк)")
+        standalone["rows"] = benchmark_rows(args.rows, args.seed, args.repeat)
+    if standalone:
+        report["results"]["standalone"] = standalone
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    log(f"Результаты сохранены в файл {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare_results(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
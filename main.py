@@ -1,6 +1,22 @@
+import argparse
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+
 from config import config
-from src.db_manager import DBManager
+from src.aggregator import aggregate_vacancies
+from src.base_job_api import PROVIDERS
+from src.db_manager import DBManager, SchemaVersionError
+from src.enrichment import enrich_vacancies
+from src.file_job_api import FileJobAPI
 from src.hh_api import HeadHunterAPI
+from src.http_cache import ResponseCache
+from src.exporters import FORMATS, export_rows
+from src.metrics import METRICS, serve_metrics
+from src.pipeline import sync_vacancies
+from src.presentation import format_company, format_salary_stats, format_vacancy
+# Модуль импортируется только для регистрации источника superjob в реестре PROVIDERS (декоратор register_provider)
+from src.superjob_api import SuperJobAPI  # noqa: F401
 
 # Список id организаций (на hh.ru)
 COMPANY_IDS = ["4306244",  # "VICTORY_group"
@@ -15,9 +31,10 @@ COMPANY_IDS = ["4306244",  # "VICTORY_group"
                 "3529"  # "СБЕР"
                ]
 DB_NAME = 'hh_database'  # Название создаваемой БД
+CACHE_FILE = 'hh_cache.sqlite3'  # Файл кеша ответов API hh.ru
 
 
-def user_interaction(vacancies_list: list[dict]) -> None:
+def user_interaction() -> None:
     """Функция для взаимодействия с пользователем и анализа вакансий"""
 
     while True:
@@ -26,27 +43,31 @@ def user_interaction(vacancies_list: list[dict]) -> None:
         2. Получить список всех вакансий с их кратким описанием.
         3. Получить список всех вакансий, у которых зарплата выше средней по всем вакансиям.
         4. Получить список всех вакансий по ключевому слову.
-        5. Завершить работу программы.  """).strip(" .,!?\"\n\t")
+        5. Получить статистику зарплат по компаниям (медиана и процентили).
+        6. Завершить работу программы.  """).strip(" .,!?\"\n\t")
 
         # Обработка ответа пользователя
-        if user_answer not in ["1", "2", "3", "4", "5"]:
-            print(f"Выбран несуществующий пункт меню {user_answer}. Введите число от 1 до 5.")
+        if user_answer not in ["1", "2", "3", "4", "5", "6"]:
+            print(f"Выбран несуществующий пункт меню {user_answer}. Введите число от 1 до 6.")
             continue  # Возврат к меню
 
-        elif user_answer == "5":
+        elif user_answer == "6":
             print("Программа завершает работу. До встречи.")
             break
 
         elif user_answer == "1":
             try:
-                print(*data_base.get_companies_list())  # Вывод списка компаний с количеством вакансий
+                # Вывод списка компаний с количеством вакансий
+                print(*map(format_company, data_base.get_companies_list()))
             except Exception as error:
                 print(f"При работе с базой данных произошла ошибка: {error}")
                 continue  # Возврат к меню
 
         elif user_answer == "2":
             try:
-                print(*data_base.get_vacancies_list())  # Вывод списка вакансий с кратким описанием
+                # Вывод списка вакансий с кратким описанием (по мере чтения из БД)
+                for vacancy in data_base.iter_vacancies_list():
+                    print(format_vacancy(vacancy))
             except Exception as error:
                 print(f"При работе с базой данных произошла ошибка: {error}")
                 continue  # Возврат к меню
@@ -54,55 +75,240 @@ def user_interaction(vacancies_list: list[dict]) -> None:
         elif user_answer == "3":
             try:
                 print(f"Средняя зарплата по всем вакансиям составляет {data_base.get_avg_salary()} руб.")
-                print(*data_base.get_vacancies_list_with_higher_salary())  # Вывод списка вакансий с з/п выше средней
+                # Вывод списка вакансий с з/п выше средней (по мере чтения из БД)
+                for vacancy in data_base.iter_vacancies_list_with_higher_salary():
+                    print(format_vacancy(vacancy))
             except Exception as error:
                 print(f"При работе с базой данных произошла ошибка: {error}")
                 continue  # Возврат к меню
 
         elif user_answer == "4":
             while True:
-                keyword = input("Введите ключевое слово (например, Python) или введите '0' для возврата в меню: ").strip(" .,!?\"\n\t")
+                keyword = input("Введите ключевое слово (например, Python) или введите '0' для возврата в меню: "
+                                ).strip(" .,!?\"\n\t")
                 if keyword == "0":
                     break  # Прерывание цикла поиска по ключевому слову. Возврат в меню
                 try:
                     result = data_base.get_vacancies_list_by_keyword(keyword)
                     if result:
-                        print(*result)  # Вывод списка вакансий по ключевому слову
+                        # Вывод списка вакансий по ключевому слову
+                        print(*(format_vacancy(vacancy, url_label="Ссылка на вакансию (на hh.ru)")
+                                for vacancy in result))
                     else:
-                        print(f"Не найдено ни одной вакансии по ключевому слову '{keyword}'. Попробуйте уточнить запрос.")
+                        print(f"Не найдено ни одной вакансии по ключевому слову '{keyword}'. "
+                              f"Попробуйте уточнить запрос.")
                         continue
                 except Exception as error:
                     print(f"При работе с базой данных произошла ошибка: {error}")
                     break  # Прерывание цикла поиска по ключевому слову. Возврат к меню
 
+        elif user_answer == "5":
+            try:
+                # Вывод статистики зарплат (в рублях) по каждой компании
+                print(*map(format_salary_stats, data_base.get_salary_stats()))
+            except Exception as error:
+                print(f"При работе с базой данных произошла ошибка: {error}")
+                continue  # Возврат к меню
+
+
+def read_company_ids(filename: str) -> list[str]:
+    """Функция чтения id организаций (на hh.ru) из файла: по одному id в строке, строки после '#' не учитываются"""
+    with open(filename, encoding="utf-8") as file:
+        return [line.split("#")[0].strip() for line in file if line.split("#")[0].strip()]
+
+
+def parse_employer_ids(employer_ids: list[str]) -> dict[str, list[str]]:
+    """Функция разбора id организаций с префиксом источника (например, 'superjob:12345'; без префикса - id на hh.ru).
+    Возвращает словарь {источник вакансий: список id организаций} в порядке регистрации источников."""
+    employers = {}
+    for employer_id in employer_ids:
+        source, _, company_id = employer_id.rpartition(":")
+        source = source if source else HeadHunterAPI.source
+        if source not in PROVIDERS or source == FileJobAPI.source:
+            raise ValueError(f"Неизвестный источник вакансий '{source}' у организации '{employer_id}'.")
+        employers.setdefault(source, []).append(company_id)
+
+    return {source: employers[source] for source in PROVIDERS if source in employers}
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """Функция разбора аргументов командной строки для работы программы без взаимодействия с пользователем"""
+    parser = argparse.ArgumentParser(description="Работа с вакансиями с сайта hh.ru без интерактивного меню.")
+    parser.add_argument("--db-name", default=DB_NAME, help=f"название БД (по умолчанию {DB_NAME})")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", dest="output_format",
+                        help="формат вывода результатов (по умолчанию jsonl)")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="файл для сохранения метрик производительности в формате Prometheus")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="порт HTTP-сервера с метриками в формате Prometheus (на время работы команды)")
+    parser.add_argument("--slow-query-ms", type=float, metavar="MS",
+                        help="выводить в stderr SQL-запросы, выполняющиеся дольше MS миллисекунд")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="загрузить вакансии от API hh.ru в БД")
+    employers = sync_parser.add_mutually_exclusive_group()
+    employers.add_argument("--employers", nargs="+", metavar="ID",
+                           help="id организаций на hh.ru или с префиксом источника (например, superjob:12345)")
+    employers.add_argument("--employers-file", metavar="FILE", help="файл с id организаций (по одному в строке)")
+    sync_parser.add_argument("--fixture", metavar="FILE",
+                             help="JSON-файл с вакансиями для загрузки вместе с данными API")
+    sync_parser.add_argument("--offline", action="store_true", help="использовать только сохраненные ответы API")
+    sync_parser.add_argument("--no-details", action="store_true", help="не загружать подробные данные о вакансиях")
+    sync_parser.add_argument("--rebuild", action="store_true",
+                             help="пересоздать БД перед загрузкой (история вакансий будет удалена)")
+
+    commands.add_parser("companies", help="список компаний с количеством вакансий")
+    commands.add_parser("vacancies", help="список всех вакансий")
+    commands.add_parser("top-salary", help="вакансии с зарплатой выше средней")
+    commands.add_parser("salary-stats", help="статистика зарплат по компаниям (медиана и процентили)")
+
+    search_parser = commands.add_parser("search", help="поиск вакансий по ключевым словам")
+    search_parser.add_argument("keyword", help="ключевые слова")
+    search_parser.add_argument("--limit", type=int, help="максимальное количество вакансий")
+    search_parser.add_argument("--offset", type=int, default=0, help="количество пропускаемых вакансий")
+
+    # Отчеты по истории вакансий (since - начало интервала в формате ГГГГ-ММ-ДД)
+    periods = ("day", "week", "month", "quarter", "year")
+    trend_parser = commands.add_parser("salary-trend", help="динамика зарплат по периодам")
+    trend_parser.add_argument("--keyword", help="подстрока в названии вакансии")
+    trend_parser.add_argument("--company", type=int, help="id организации на hh.ru")
+    trend_parser.add_argument("--since", type=datetime.fromisoformat, help="начало интервала (ГГГГ-ММ-ДД)")
+    trend_parser.add_argument("--period", choices=periods, default="month", help="период (по умолчанию month)")
+    openings_parser = commands.add_parser("openings", help="открытые и закрытые вакансии компаний по периодам")
+    openings_parser.add_argument("--since", type=datetime.fromisoformat, help="начало интервала (ГГГГ-ММ-ДД)")
+    openings_parser.add_argument("--period", choices=periods, default="month", help="период (по умолчанию month)")
+    close_parser = commands.add_parser("time-to-close", help="время закрытия вакансий по компаниям")
+    close_parser.add_argument("--since", type=datetime.fromisoformat, help="начало интервала (ГГГГ-ММ-ДД)")
+
+    return parser.parse_args(argv)
+
+
+def sync(args: argparse.Namespace) -> None:
+    """Функция синхронизации вакансий (команда 'python main.py sync', например, для запуска по расписанию cron).
+    Если вакансии загружаются только с hh.ru, загрузка от API и запись в БД выполняются одновременно.
+    Вакансии из нескольких источников загружаются параллельно и записываются в БД после удаления дубликатов."""
+    company_ids = COMPANY_IDS
+    if args.employers:
+        company_ids = args.employers
+    elif args.employers_file:
+        company_ids = read_company_ids(args.employers_file)
+    employers = parse_employer_ids(company_ids)
+
+    if args.rebuild:
+        DBManager(args.db_name, config()).close()  # Удаление БД и создание схемы текущей версии
+
+    cache = ResponseCache(CACHE_FILE)
+    with (DBManager(args.db_name, config(), incremental=True) as db,
+          HeadHunterAPI(cache=cache, offline=args.offline) as api,
+          ExitStack() as stack):
+        db.update_currency_rates(api.get_currency_rates())  # Курсы валют для расчета зарплат в рублях
+
+        if list(employers) == [api.source] and not args.fixture:
+            vacancies_amount = sync_vacancies(api, db, employers[api.source])
+        else:
+            providers = []
+            for source, source_company_ids in employers.items():
+                provider = api if source == api.source else \
+                    stack.enter_context(PROVIDERS[source](cache=cache, offline=args.offline))
+                providers.append((provider, source_company_ids))
+            if args.fixture:
+                providers.append((FileJobAPI(args.fixture), None))
+
+            records = aggregate_vacancies(providers)
+            # Архивными помечаются только вакансии запрошенных компаний и компаний из файла с вакансиями,
+            # кроме компаний, вакансии которых получены не все
+            companies = {(source, company_id) for source, ids in employers.items() for company_id in ids}
+            companies.update((record.source, str(record.company_id)) for record in records)
+            companies.difference_update((provider.source, company_id) for provider, _ in providers
+                                        for company_id in getattr(provider, "truncated_company_ids", ()))
+            db.insert_data_to_db(records, companies=companies)
+            vacancies_amount = len(records)
+        print(f"Синхронизация завершена. Загружено вакансий: {vacancies_amount}.", file=sys.stderr)
+        if not args.no_details:
+            enrich_vacancies(api, db)  # Подробные данные только о новых и изменившихся вакансиях
+
+
+def run_command(argv: list[str]) -> None:
+    """Функция выполнения команды командной строки. Результаты запросов выводятся в stdout в выбранном формате."""
+    args = parse_args(argv)
+    if args.slow_query_ms is not None:
+        METRICS.slow_query_threshold = args.slow_query_ms / 1000
+    metrics_server = serve_metrics(args.metrics_port) if args.metrics_port else None
+
+    try:
+        run_subcommand(args)
+    except SchemaVersionError as error:  # Схема существующей БД устарела - нужна команда 'sync --rebuild'
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.metrics_file:
+            METRICS.dump(args.metrics_file)
+
+
+def run_subcommand(args: argparse.Namespace) -> None:
+    """Функция выполнения подкоманды с разобранными аргументами командной строки"""
+    if args.command == "sync":
+        sync(args)
+        return
+
+    # БД открывается без удаления данных, результаты выводятся по мере чтения из БД
+    with DBManager(args.db_name, config(), incremental=True) as db:
+        if args.command == "companies":
+            rows = db.get_companies_list()
+        elif args.command == "vacancies":
+            rows = db.iter_vacancies_list()
+        elif args.command == "top-salary":
+            rows = db.iter_vacancies_list_with_higher_salary()
+        elif args.command == "salary-stats":
+            rows = db.get_salary_stats()
+        elif args.command == "salary-trend":
+            rows = db.get_salary_trend(args.keyword, args.company, since=args.since, period=args.period)
+        elif args.command == "openings":
+            rows = db.get_openings_by_company(args.since, args.period)
+        elif args.command == "time-to-close":
+            rows = db.get_time_to_close(args.since)
+        else:
+            rows = db.iter_vacancies_list_by_keyword(args.keyword, args.limit, args.offset)
+
+        export_rows(rows, args.output_format)
+
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:  # Запуск с аргументами командной строки - без интерактивного меню
+        run_command(sys.argv[1:])
+        sys.exit()
+
     print("Добро пожаловать в программу работы с вакансиями с сайта hh.ru!")
 
     db_params = config()  # Извлечение параметров для подключения к БД из файла database.ini
-    data_base = DBManager(DB_NAME, db_params)  # Создание объекта БД
+    try:
+        # Создание объекта БД (без удаления прежних данных)
+        data_base = DBManager(DB_NAME, db_params, incremental=True)
+    except SchemaVersionError as error:  # Схема существующей БД устарела
+        print(error)
+        sys.exit(1)
 
     # Создание экземпляра класса для работы с API сайта hh.ru
-    hh_api = HeadHunterAPI()
+    hh_api = HeadHunterAPI(cache=ResponseCache(CACHE_FILE))
 
-    vacancies_list = []  # Список с вакансиями пока пустой
+    vacancies_amount = 0  # Вакансии пока не загружены
 
     try:
-        # Получение вакансий от указанных в списке 'COMPANY_IDS' компаний с API сайта hh.ru
-        vacancies_list = hh_api.get_vacancies(COMPANY_IDS)
-        print(vacancies_list)  # Тест
-    except TypeError as error:
-        print(error)
+        data_base.update_currency_rates(hh_api.get_currency_rates())  # Курсы валют для расчета зарплат в рублях
+        # Загрузка вакансий указанных в списке 'COMPANY_IDS' компаний с API сайта hh.ru одновременно с записью в БД
+        # (полный список вакансий в памяти не собирается; отсутствующие в загрузке вакансии помечаются архивными)
+        vacancies_amount = sync_vacancies(hh_api, data_base, COMPANY_IDS)
+        enrich_vacancies(hh_api, data_base)  # Подробные данные только о новых и изменившихся вакансиях
+    except Exception as error:
+        print(f"При заполнении базы данных произошла ошибка: {error}")
 
     # Выполняется анализ полученных данных. Если произошла ошибка или вакансии не были найдены,- завершение работы
-    finally:
-        if vacancies_list:  # Если данные от API получены успешно...
-            try:
-                data_base.insert_data_to_db(vacancies_list)  # Заполнение БД
-            except Exception as error:
-                print(f"При заполнении базы данных произошла ошибка: {error}")
+    if vacancies_amount:  # Если данные от API получены успешно...
+        # Вызов функции для взаимодействия с пользователем и анализа вакансий
+        user_interaction()
+    else:
+        print("Не удалось получить данные о вакансиях от API hh.ru")
 
-            # Вызов функции для взаимодействия с пользователем и анализа вакансий
-            user_interaction(vacancies_list)
-        else:
-            print("Не удалось получить данные о вакансиях от API hh.ru")
+    data_base.close()  # Закрытие соединений с БД
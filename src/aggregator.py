@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.base_job_api import JobAPI
+from src.models import VacancyRecord
+
+
+def deduplicate_vacancies(records: list[VacancyRecord]) -> list[VacancyRecord]:
+    """Функция удаления дубликатов вакансий, опубликованных в нескольких источниках.
+    Дубликаты ищутся по "отпечатку" вакансии (название, компания, зарплата), сохраняется первая из найденных.
+    Вакансии одного источника с одинаковым "отпечатком" считаются разными (например, в разных городах)."""
+    sources = {}  # {"отпечаток" вакансии: источник, из которого вакансия взята}
+    result = []
+    for record in records:
+        source = sources.setdefault(record.fingerprint(), record.source)
+        if source == record.source:
+            result.append(record)
+    return result
+
+
+def aggregate_vacancies(providers: list[tuple[JobAPI, list[str] | None]],
+                        max_workers: int | None = None) -> list[VacancyRecord]:
+    """Функция загрузки вакансий из нескольких источников.
+    Принимает список пар (источник вакансий, список id организаций в этом источнике).
+    Источники опрашиваются параллельно, вакансии возвращаются в едином формате без дубликатов
+    (при совпадении приоритет у источника, стоящего в списке раньше)."""
+    if not providers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers if max_workers else len(providers)) as executor:
+        futures = [executor.submit(provider.get_records, company_ids) for provider, company_ids in providers]
+        records = [record for future in futures for record in future.result()]
+
+    return deduplicate_vacancies(records)
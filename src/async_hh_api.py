@@ -0,0 +1,152 @@
+import asyncio
+import sys
+from collections import deque
+from collections.abc import AsyncIterator
+
+import aiohttp
+
+from src.base_job_api import JobAPI
+from src.hh_api import HeadHunterAPI
+from src.http_client import APIResponseError, get_retry_delay
+from src.rate_limiter import TokenBucket
+
+
+class AsyncHeadHunterAPI(JobAPI):
+    """Класс для асинхронного поиска вакансий на платформе hh.ru (на основе asyncio и aiohttp)"""
+    source = HeadHunterAPI.source  # Название источника вакансий
+    VACANCIES_URL = HeadHunterAPI.VACANCIES_URL  # URL для поиска вакансий
+    MAX_DEPTH = HeadHunterAPI.MAX_DEPTH  # Максимальное количество вакансий по одному поисковому запросу
+    RETRY_STATUSES = HeadHunterAPI.RETRY_STATUSES  # Коды ответов, при которых запрос повторяется
+
+    params: dict  # Параметры для GET-запроса по API hh.ru
+
+    normalize = staticmethod(HeadHunterAPI.normalize)  # Преобразование вакансии в единый формат VacancyRecord
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 3, backoff_factor: float = 0.5,
+                 rate_limit: float = 10.0, timeout: float = 10.0, max_backoff: float = 60.0) -> None:
+        """Метод-конструктор для инициализации экземпляров класса AsyncHeadHunterAPI.
+        max_concurrency - максимальное количество одновременных запросов к API,
+        остальные параметры аналогичны параметрам класса HeadHunterAPI."""
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError("Количество одновременных запросов должно быть целым положительным числом.")
+
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.truncated_company_ids = set()  # id компаний, вакансии которых при последней загрузке получены не все
+
+        self.__rate_limiter = TokenBucket(rate_limit)  # Ограничение частоты запросов на стороне клиента
+
+    def _connect(self, params):
+        """Метод подключения к API (защищенный). Синхронная обертка над '_connect_async' для одиночного запроса."""
+
+        async def connect() -> dict:
+            async with self._create_session() as session:
+                return await self._connect_async(session, asyncio.Semaphore(1), params)
+
+        return asyncio.run(connect())
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Метод создания HTTP-сессии с пулом соединений по размеру 'max_concurrency' (защищенный)"""
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                                     timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def _connect_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                             params: dict) -> dict:
+        """Метод асинхронного подключения к API (защищенный).
+        Возвращает ответ API в формате JSON. Запросы с кодами 429/5xx и сбои соединения повторяются."""
+        if not isinstance(params, dict):
+            raise ValueError("Неверный тип данных у атрибута 'params'.")
+
+        async with semaphore:  # Ограничение количества одновременных запросов
+            for attempt in range(self.max_retries + 1):
+                await self.__rate_limiter.acquire_async()
+
+                try:
+                    async with session.get(self.VACANCIES_URL, params=params) as response:
+                        if response.status == 200:
+                            return await response.json()  # Возврат ответа от API, если запрос удачный
+
+                        if response.status not in self.RETRY_STATUSES or attempt == self.max_retries:
+                            raise APIResponseError(
+                                f"Неудачная попытка API-запроса по адресу '{self.VACANCIES_URL}'. Возможная причина: "
+                                f"{response.reason}.", response.status)
+
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.max_retries:
+                        raise
+                    retry_after = None
+
+                # Задержка из заголовка 'Retry-After' или экспоненциальная задержка (как у синхронного клиента)
+                await asyncio.sleep(get_retry_delay(retry_after, attempt, self.backoff_factor, self.max_backoff))
+
+    async def _get_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                        company_id: str, page_number: int, per_page: int) -> dict:
+        """Метод асинхронного получения одной страницы с вакансиями компании (защищенный)"""
+        params = {
+            "employer_id": company_id,
+            "per_page": per_page,
+            "page": page_number,
+        }
+        return await self._connect_async(session, semaphore, params)
+
+    async def iter_vacancies(self, company_ids: list[str], page=100) -> AsyncIterator[list[dict]]:
+        """Асинхронный генератор вакансий по id организаций (на hh.ru).
+        Возвращает вакансии постранично (списками словарей) по мере получения ответов от API,
+        поэтому обработка данных может начинаться до окончания загрузки всех страниц.
+        id компаний, у которых найдено больше MAX_DEPTH вакансий, сохраняются в атрибуте 'truncated_company_ids'."""
+        if not isinstance(company_ids, list):
+            raise TypeError("Неверный тип данных у параметров запроса вакансий.")
+
+        self.truncated_company_ids = set()
+        max_pages = max(self.MAX_DEPTH // page, 1)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._create_session() as session:
+            # Очередь страниц на загрузку: сначала первые страницы по всем компаниям.
+            # Задач одновременно не больше 'max_concurrency', новые создаются после выдачи полученных страниц
+            queue = deque((company_id, 0) for company_id in company_ids)
+            pending = {}
+            try:
+                while queue or pending:
+                    while queue and len(pending) < self.max_concurrency:
+                        company_id, page_number = queue.popleft()
+                        task = asyncio.create_task(self._get_page(session, semaphore, company_id, page_number, page))
+                        pending[task] = (company_id, page_number)
+
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        company_id, page_number = pending.pop(task)
+                        result = task.result()
+
+                        # После получения первой страницы компании - в очередь остальные ее страницы
+                        if page_number == 0:
+                            # Выдача больше MAX_DEPTH вакансий на части не разбивается (в отличие от HeadHunterAPI)
+                            if result.get("found", 0) > self.MAX_DEPTH:
+                                self.truncated_company_ids.add(company_id)
+                                print(f"Получены не все вакансии компании {company_id}: hh.ru отдает не больше "
+                                      f"{self.MAX_DEPTH} из {result['found']} найденных.", file=sys.stderr)
+                            queue.extend((company_id, next_page)
+                                         for next_page in range(1, min(result.get("pages", 1), max_pages)))
+
+                        yield result.get("items", [])
+            finally:
+                # Отмена незавершенных задач при ошибке или досрочном прекращении перебора
+                for task in pending:
+                    task.cancel()
+
+    async def get_vacancies_async(self, company_ids: list[str], page=100) -> list[dict]:
+        """Асинхронный вариант метода 'get_vacancies'"""
+        vacancies = []
+        async for items in self.iter_vacancies(company_ids, page):
+            vacancies.extend(items)
+        return vacancies
+
+    def get_vacancies(self, company_ids: list[str], page=100) -> list[dict] | None:
+        """Метод получения вакансий по id организаций (на hh.ru).
+        Принимает список id номеров компаний.
+        Возвращает список словарей с данными о вакансиях (порядок вакансий соответствует порядку получения страниц)."""
+        return asyncio.run(self.get_vacancies_async(company_ids, page))
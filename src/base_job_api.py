@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 
+from src.models import VacancyRecord
+
 
 class JobAPI(ABC):
     """Абстрактный класс для создания подклассов поиска вакансий"""
 
+    source: str  # Короткое название источника вакансий (значение столбца 'source' в БД)
     params: dict  # Параметры для GET-запроса по API платформы поиска вакансий
 
     @abstractmethod
@@ -15,3 +18,25 @@ class JobAPI(ABC):
     def get_vacancies(self, company_ids):
         """Метод получения вакансий по id организаций (на hh.ru)"""
         pass
+
+    @staticmethod
+    @abstractmethod
+    def normalize(vacancy: dict) -> VacancyRecord:
+        """Метод преобразования вакансии из ответа API в единый формат VacancyRecord"""
+        pass
+
+    def get_records(self, company_ids: list[str]) -> list[VacancyRecord]:
+        """Метод получения вакансий по id организаций в едином формате (для загрузки из нескольких источников)"""
+        return [self.normalize(vacancy) for vacancy in self.get_vacancies(company_ids)]
+
+
+# Реестр источников вакансий: {название источника: класс для работы с его API}
+PROVIDERS: dict[str, type[JobAPI]] = {}
+
+
+def register_provider(cls: type[JobAPI]) -> type[JobAPI]:
+    """Декоратор для регистрации класса источника вакансий в реестре PROVIDERS (по значению атрибута 'source')"""
+    if cls.source in PROVIDERS:
+        raise ValueError(f"Источник вакансий '{cls.source}' уже зарегистрирован.")
+    PROVIDERS[cls.source] = cls
+    return cls
@@ -1,19 +1,199 @@
+import csv
+import io
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
 
 import psycopg2
 import json
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+from src.hh_api import HeadHunterAPI
+from src.metrics import METRICS
+from src.models import (Company, CompanyOpenings, SalaryStats, SalaryTrend, TimeToClose, Vacancy,
+                        VacancyRecord)
+
+
+class SchemaVersionError(ValueError):
+    """Исключение для существующей БД, версия схемы которой не совпадает с DBManager.SCHEMA_VERSION"""
+
+
+class TimedCursor(cursor):
+    """Курсор, измеряющий длительность выполнения SQL-команд, в т.ч. загрузки данных командой COPY
+    (для метрик и журнала медленных запросов)"""
+
+    @staticmethod
+    def _observe(query, start: float) -> None:
+        """Учет длительности выполнения SQL-команды, начатой в момент 'start' (защищенный метод)"""
+        duration = time.perf_counter() - start
+        METRICS.observe("db_statement_duration_seconds", duration)
+        METRICS.log_slow_query(query if isinstance(query, str) else query.decode(), duration)
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._observe(query, start)
+
+    def copy_expert(self, sql, file, size=8192):
+        start = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            self._observe(sql, start)
 
 
 class DBManager:
-    def __init__(self, db_name: str, params: dict) -> None:
-        """Метод-конструктор для инициализации экземпляров класса DBManager."""
+    # Версия схемы БД: увеличивается при изменениях, которые нельзя применить к существующей БД командами
+    # 'CREATE ... IF NOT EXISTS' / 'ADD COLUMN IF NOT EXISTS' (такую БД нужно пересоздать)
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_name: str, params: dict, incremental: bool = False,
+                 min_connections: int = 1, max_connections: int = 5, itersize: int = 1000,
+                 cache_size: int = 128, pool_timeout: float = 30.0, cache_max_rows: int = 1000) -> None:
+        """Метод-конструктор для инициализации экземпляров класса DBManager.
+        При incremental=True существующая БД не удаляется: схема создается только при создании БД
+        (команды изменения схемы в существующей БД не выполняются и не блокируют таблицы, которые в это время
+        читают или заполняют другие процессы), а при загрузке данных вакансии обновляются (upsert)
+        по источнику и 'hh_vacancy_id'.
+        Если версия схемы существующей БД отличается от SCHEMA_VERSION, вызывается исключение SchemaVersionError
+        (БД нужно пересоздать, например, командой 'python main.py sync --rebuild').
+        min_connections, max_connections - границы размера пула соединений с БД,
+        pool_timeout - время ожидания свободного соединения (в секундах), если заняты все 'max_connections' соединений,
+        itersize - количество строк, получаемых с сервера за один раз при потоковом чтении результатов,
+        cache_size - максимальное количество результатов запросов, хранимых в памяти (0 - без кеширования),
+        cache_max_rows - максимальное количество строк в одном результате, сохраняемом в кеш (результаты большего
+        размера не кешируются, поэтому кеш не может занять память объемом в несколько таблиц)."""
         self.db_name = db_name
         self.params = params
+        self.incremental = incremental
+        self.itersize = itersize
+        # Доступен ли поиск по подстроке через индекс pg_trgm (определяется при создании таблиц)
+        self.trigram_search = False
+
+        # Кеш результатов запросов: {(версия данных, запрос, параметры): результат} в порядке последнего обращения.
+        # Версия данных увеличивается при каждом изменении данных через этот объект, поэтому устаревшие результаты
+        # не используются (изменения, внесенные в БД другими процессами, кеш не отслеживает)
+        self.cache_size = cache_size
+        self.cache_max_rows = cache_max_rows
+        self.data_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.__query_cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+
+        created = self._create_database()
+        if not created:
+            self._check_schema_version()  # Схема существующей БД должна соответствовать текущей версии
+
+        # Пул соединений с созданной БД, общий для всех методов класса
+        self.__pool = ThreadedConnectionPool(min_connections, max_connections, dbname=self.db_name,
+                                             cursor_factory=TimedCursor, **self.params)
+        # Пул не ждет освобождения соединений (при исчерпании вызывает PoolError), поэтому количество выданных
+        # соединений ограничивается семафором: лишние потоки ждут, пока другие вернут соединения в пул
+        self.pool_timeout = pool_timeout
+        self.__pool_semaphore = threading.BoundedSemaphore(max_connections)
+
+        if created:
+            self._create_tables()  # Создание таблиц в новой (или пересозданной) БД
+        else:
+            self.trigram_search = self._has_trigram_index()
+
+    def __enter__(self) -> "DBManager":
+        """Метод входа в контекстный менеджер"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Метод выхода из контекстного менеджера (закрытие пула соединений)"""
+        self.close()
+
+    def close(self) -> None:
+        """Метод закрытия всех соединений из пула"""
+        if not self.__pool.closed:
+            self.__pool.closeall()
+
+    @contextmanager
+    def _connection(self):
+        """Контекстный менеджер для получения соединения из пула и его возврата в пул (защищенный метод).
+        Если заняты все соединения, ожидает освобождения одного из них не дольше 'pool_timeout' секунд.
+        Незавершенная транзакция при возврате соединения в пул откатывается."""
+        if not self.__pool_semaphore.acquire(timeout=self.pool_timeout):
+            raise PoolError(f"Нет свободных соединений с БД: все соединения пула заняты дольше "
+                            f"{self.pool_timeout} с. Увеличьте 'max_connections' или закройте незавершенные запросы.")
+        try:
+            conn = self.__pool.getconn()
+            try:
+                yield conn
+            finally:
+                self.__pool.putconn(conn)
+        finally:
+            self.__pool_semaphore.release()
+
+    def _iter_rows(self, query: str, params: dict | tuple | None = None) -> Iterator[tuple]:
+        """Генератор строк результата SQL-запроса (защищенный метод).
+        Используется серверный (именованный) курсор: строки получаются с сервера порциями по 'itersize',
+        поэтому расход памяти не зависит от размера результата."""
+        with self._connection() as conn, conn.cursor(name="stream_cursor") as cur:  # Соединение из пула
+            cur.itersize = self.itersize
+            cur.execute(query, params)
+            yield from cur
+
+    def _cached(self, key: tuple, load: Callable):
+        """Получение результата запроса из кеша или его выполнение с сохранением результата в кеш (защищенный метод).
+        key - название запроса и его параметры, load - функция выполнения запроса (возвращает кортеж строк
+        или одно значение). Результаты больше 'cache_max_rows' строк не сохраняются.
+        При переполнении кеша удаляется результат, к которому дольше всего не обращались."""
+        if not self.cache_size:
+            return load()
 
-        self._create_database()  # Создание БД
-        self._create_tables()  # Создание таблиц в БД
+        with self.__cache_lock:
+            key = (self.data_version, *key)
+            if key in self.__query_cache:
+                self.cache_hits += 1
+                METRICS.inc("db_query_cache_hits_total")
+                self.__query_cache.move_to_end(key)
+                return self.__query_cache[key]
+            self.cache_misses += 1
+            METRICS.inc("db_query_cache_misses_total")
 
-    def _create_database(self) -> None:
-        """Создание базы данных для сохранения данных о компаниях и их вакансиях на hh.ru"""
+        result = load()  # Запрос выполняется вне блокировки, чтобы не задерживать другие потоки
+
+        rows = len(result) if isinstance(result, tuple) else 1
+        with self.__cache_lock:
+            # Результат сохраняется, если данные не изменились за время выполнения запроса и он не слишком большой
+            if key[0] == self.data_version and rows <= self.cache_max_rows:
+                self.__query_cache[key] = result
+                while len(self.__query_cache) > self.cache_size:
+                    self.__query_cache.popitem(last=False)
+        return result
+
+    def _invalidate_cache(self) -> None:
+        """Увеличение версии данных и очистка кеша результатов запросов после изменения данных (защищенный метод)"""
+        with self.__cache_lock:
+            self.data_version += 1
+            self.__query_cache.clear()
+
+    def cache_info(self) -> dict:
+        """Метод получения статистики кеша результатов запросов: попадания, промахи, размер и версия данных"""
+        with self.__cache_lock:
+            return {"hits": self.cache_hits,
+                    "misses": self.cache_misses,
+                    "size": len(self.__query_cache),
+                    "max_size": self.cache_size,
+                    "max_rows": self.cache_max_rows,
+                    "data_version": self.data_version}
+
+    def _create_database(self) -> bool:
+        """Создание базы данных для сохранения данных о компаниях и их вакансиях на hh.ru.
+        Возвращает False, если в инкрементальном режиме БД уже существовала."""
 
         conn = psycopg2.connect(dbname='postgres', **self.params)  # Подключение к БД postgres
 
@@ -22,246 +202,848 @@ class DBManager:
 
         cur = conn.cursor()  # Создание объекта 'КУРСОР' для выполнения SQL-команд
 
-        cur.execute(f"DROP DATABASE IF EXISTS {self.db_name};")
-        cur.execute(f"CREATE DATABASE {self.db_name} WITH ENCODING 'UTF8';")
+        if self.incremental:
+            # В инкрементальном режиме БД создается только при ее отсутствии
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (self.db_name,))
+            created = cur.fetchone() is None
+            if created:
+                cur.execute(f"CREATE DATABASE {self.db_name} WITH ENCODING 'UTF8';")
+        else:
+            cur.execute(f"DROP DATABASE IF EXISTS {self.db_name};")
+            cur.execute(f"CREATE DATABASE {self.db_name} WITH ENCODING 'UTF8';")
+            created = True
 
         cur.close()
         conn.close()  # Закрытие подключения к БД
+        return created
+
+    def _check_schema_version(self) -> None:
+        """Проверка версии схемы существующей БД (защищенный метод).
+        В БД, созданных до появления таблицы 'schema_info', версия считается равной 0."""
+        conn = psycopg2.connect(dbname=self.db_name, **self.params)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('schema_info') IS NOT NULL;")
+                version = 0
+                if cur.fetchone()[0]:
+                    cur.execute("SELECT MAX(version) FROM schema_info;")
+                    version = cur.fetchone()[0] or 0
+        finally:
+            conn.close()
+
+        if version != self.SCHEMA_VERSION:
+            raise SchemaVersionError(
+                f"Версия схемы БД '{self.db_name}' ({version}) не совпадает с требуемой ({self.SCHEMA_VERSION}). "
+                f"Пересоздайте БД командой 'python main.py sync --rebuild' (история вакансий будет удалена).")
+
+    def _has_trigram_index(self) -> bool:
+        """Проверка наличия триграммного индекса по названию вакансии в существующей БД (защищенный метод)"""
+        with self._connection() as conn, conn, conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('idx_vacancy_title_trgm') IS NOT NULL;")
+            return cur.fetchone()[0]
 
     def _create_tables(self):
-        """Создание таблиц в БД"""
+        """Создание таблиц в БД (если они еще не созданы)"""
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        conn.autocommit = True
+        with self._connection() as conn, conn:  # Соединение из пула, изменения вносятся в одной транзакции
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS company 
+                    (
+                        id SERIAL PRIMARY KEY,
+                        source VARCHAR(20) NOT NULL DEFAULT 'hh',
+                        hh_company_id INT NOT NULL,
+                        company_name VARCHAR NOT NULL,
+                        last_synced_at TIMESTAMP,
+                        UNIQUE (source, hh_company_id)
+                    )
+                """)
 
-        with conn.cursor() as cur:
-            cur.execute("""
-                CREATE TABLE company 
-                (
-                    id SERIAL PRIMARY KEY,
-                    hh_company_id INT UNIQUE NOT NULL,
-                    company_name VARCHAR(255) NOT NULL                    
-                )
+            # Внешний ключ проверяется в конце транзакции, поэтому компании можно заполнять после вакансий.
+            # Столбцы 'hh_vacancy_id' и 'hh_company_id' хранят id вакансии и компании в источнике 'source'
+            # Длина названий и ссылок не ограничена: у разных источников они разной длины (например, ссылки
+            # superjob.ru содержат название профессии), а одно длинное значение отменило бы всю загрузку
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS vacancy
+                     (
+                        id SERIAL PRIMARY KEY,
+                        source VARCHAR(20) NOT NULL DEFAULT 'hh',
+                        hh_vacancy_id INT NOT NULL,
+                        hh_company_id INT NOT NULL,
+                        company_name VARCHAR NOT NULL,
+                        title VARCHAR NOT NULL,
+                        salary_from INT,
+                        salary_to INT,
+                        currency VARCHAR(10),
+                        vacancy_url VARCHAR,
+                        description TEXT,
+                        is_archived BOOLEAN NOT NULL DEFAULT FALSE,
+                        updated_at TIMESTAMP NOT NULL DEFAULT now(),
+                        UNIQUE (source, hh_vacancy_id),
+                        FOREIGN KEY (source, hh_company_id)
+                            REFERENCES company(source, hh_company_id) DEFERRABLE INITIALLY DEFERRED
+                    )
+                """)
+
+            # Полнотекстовый поиск: вычисляемый столбец с лексемами названия (вес A) и описания (вес B)
+            # в русской и английской конфигурациях и GIN-индекс по нему
+            with conn.cursor() as cur:
+                cur.execute("""
+                    ALTER TABLE vacancy
+                    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+                        setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+                        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                        setweight(to_tsvector('russian', coalesce(description, '')), 'B') ||
+                        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+                    ) STORED;
+
+                    CREATE INDEX IF NOT EXISTS idx_vacancy_search_vector ON vacancy USING GIN (search_vector);
+                """)
+
+            # Статистика зарплат: курсы валют, средняя зарплата вакансии в рублях и сводка по компаниям
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS currency_rate
+                    (
+                        currency VARCHAR(10) PRIMARY KEY,
+                        rate NUMERIC NOT NULL
+                    );
+
+                    INSERT INTO currency_rate (currency, rate) VALUES ('RUR', 1) ON CONFLICT DO NOTHING;
+
+                    ALTER TABLE vacancy ADD COLUMN IF NOT EXISTS salary_mid NUMERIC(12, 2);
+
+                    CREATE INDEX IF NOT EXISTS idx_vacancy_salary_mid ON vacancy (salary_mid) WHERE NOT is_archived;
+
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS salary_stats AS
+                    SELECT
+                        source,
+                        hh_company_id,
+                        COUNT(*) AS vacancies_amount,
+                        AVG(salary_mid) AS avg_salary,
+                        percentile_cont(0.5) WITHIN GROUP (ORDER BY salary_mid) AS median_salary,
+                        percentile_cont(0.25) WITHIN GROUP (ORDER BY salary_mid) AS p25_salary,
+                        percentile_cont(0.75) WITHIN GROUP (ORDER BY salary_mid) AS p75_salary,
+                        percentile_cont(0.9) WITHIN GROUP (ORDER BY salary_mid) AS p90_salary
+                    FROM vacancy
+                    WHERE NOT is_archived AND salary_mid IS NOT NULL
+                    GROUP BY GROUPING SETS ((source, hh_company_id), ());
+                """)
+
+            # Подробные данные о вакансиях (загружаются отдельно, см. метод 'save_vacancy_details')
+            # и справочник ключевых навыков со связующей таблицей
+            with conn.cursor() as cur:
+                cur.execute("""
+                    ALTER TABLE vacancy
+                    ADD COLUMN IF NOT EXISTS full_description TEXT,
+                    ADD COLUMN IF NOT EXISTS experience VARCHAR(100),
+                    ADD COLUMN IF NOT EXISTS schedule VARCHAR(100),
+                    ADD COLUMN IF NOT EXISTS details_fetched_at TIMESTAMP;
+
+                    CREATE TABLE IF NOT EXISTS skill
+                    (
+                        id SERIAL PRIMARY KEY,
+                        skill_name VARCHAR(255) UNIQUE NOT NULL
+                    );
+
+                    CREATE TABLE IF NOT EXISTS vacancy_skill
+                    (
+                        vacancy_id INT NOT NULL REFERENCES vacancy(id) ON DELETE CASCADE,
+                        skill_id INT NOT NULL REFERENCES skill(id),
+                        PRIMARY KEY (vacancy_id, skill_id)
+                    );
+                """)
+
+            # История изменений вакансий: при каждой загрузке в 'vacancy_snapshot' добавляются только новые,
+            # изменившиеся и закрытые (архивные) вакансии. Таблица секционирована по месяцам (секции создаются
+            # при загрузке, см. метод '_create_snapshot_partition'): запросы за период читают только нужные секции,
+            # а BRIN-индекс по времени загрузки занимает мало места, т.к. строки добавляются в порядке времени
+            with conn.cursor() as cur:
+                cur.execute("""
+                    ALTER TABLE vacancy ADD COLUMN IF NOT EXISTS first_seen_at TIMESTAMP NOT NULL DEFAULT now();
+
+                    CREATE TABLE IF NOT EXISTS vacancy_snapshot
+                    (
+                        source VARCHAR(20) NOT NULL,
+                        hh_vacancy_id INT NOT NULL,
+                        fetched_at TIMESTAMP NOT NULL,
+                        change_type VARCHAR(10) NOT NULL,
+                        hh_company_id INT NOT NULL,
+                        company_name VARCHAR NOT NULL,
+                        title VARCHAR NOT NULL,
+                        salary_from INT,
+                        salary_to INT,
+                        currency VARCHAR(10),
+                        salary_mid NUMERIC(12, 2),
+                        PRIMARY KEY (source, hh_vacancy_id, fetched_at)
+                    ) PARTITION BY RANGE (fetched_at);
+
+                    CREATE INDEX IF NOT EXISTS idx_vacancy_snapshot_fetched_at
+                        ON vacancy_snapshot USING BRIN (fetched_at);
+                """)
+
+            # Версия схемы (проверяется при открытии существующей БД в инкрементальном режиме)
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_info (version INT NOT NULL);
+                    INSERT INTO schema_info (version) SELECT %s WHERE NOT EXISTS (SELECT 1 FROM schema_info);
+                """, (self.SCHEMA_VERSION,))
+
+        # Триграммный индекс для поиска по подстроке в названии
+        # (требует расширения pg_trgm, которое может быть недоступно)
+        with self._connection() as conn:
+            try:
+                with conn, conn.cursor() as cur:
+                    cur.execute("""
+                        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                        CREATE INDEX IF NOT EXISTS idx_vacancy_title_trgm ON vacancy USING GIN (title gin_trgm_ops);
+                    """)
+                self.trigram_search = True
+            except psycopg2.Error as error:
+                print(f"Поиск по подстроке в названии вакансии недоступен: {str(error).splitlines()[0]}",
+                      file=sys.stderr)  # Не смешивается с результатами, выводимыми в stdout
+
+    @staticmethod
+    def _vacancy_to_row(vacancy: dict | VacancyRecord) -> tuple:
+        """Преобразование вакансии в строку таблицы 'vacancy' (защищенный метод).
+        Принимает вакансию в едином формате (VacancyRecord) или в формате ответа API hh.ru."""
+        if not isinstance(vacancy, VacancyRecord):
+            vacancy = HeadHunterAPI.normalize(vacancy)
+        return tuple(vacancy)
+
+    def _copy_vacancies(self, cur, batches: Iterable[list[dict]], table: str = "vacancy") -> None:
+        """Загрузка вакансий в таблицу 'table' командой COPY FROM STDIN, по одной команде на порцию
+        (защищенный метод)"""
+        for batch in batches:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for vacancy in batch:
+                # Пустые значения (None) записываются маркером '\N', который COPY загружает как NULL
+                writer.writerow(["\\N" if value is None else value for value in self._vacancy_to_row(vacancy)])
+            buffer.seek(0)
+
+            cur.copy_expert(
+                f"COPY {table} (source, hh_vacancy_id, hh_company_id, company_name, title, salary_from, salary_to, "
+                "currency, vacancy_url, description) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer)
+
+    def _upsert_vacancies(self, cur, batches: Iterable[list[dict]],
+                          companies: Iterable[tuple[str, int | str]] | None = None) -> None:
+        """Инкрементальная загрузка вакансий (защищенный метод).
+        Новые вакансии добавляются, измененные - обновляются, отсутствующие в загрузке - помечаются архивными.
+        Архивными помечаются только вакансии компаний 'companies' (пары (источник, id компании)), вакансии
+        которых были запрошены полностью; при companies=None - компаний, вакансии которых есть в загрузке.
+        Записываются только изменившиеся строки."""
+
+        # Промежуточная таблица с данными последней загрузки (удаляется по окончании транзакции)
+        cur.execute("""
+            CREATE TEMP TABLE vacancy_stage ON COMMIT DROP AS
+            SELECT source, hh_vacancy_id, hh_company_id, company_name, title, salary_from, salary_to, currency,
+                vacancy_url, description
+            FROM vacancy
+            WITH NO DATA
             """)
+        self._copy_vacancies(cur, batches, table="vacancy_stage")
 
-        with conn.cursor() as cur:
-            cur.execute("""
-                CREATE TABLE vacancy
-                 (
-                    id SERIAL PRIMARY KEY,
-                    hh_vacancy_id INT UNIQUE NOT NULL,
-                    hh_company_id INT NOT NULL,
-                    company_name VARCHAR(100) NOT NULL,
-                    title VARCHAR NOT NULL,
-                    salary_from INT,
-                    salary_to INT,
-                    currency VARCHAR(10),
-                    vacancy_url VARCHAR(100),
-                    description TEXT
-                )
+        # Обновление компаний и времени их последней синхронизации
+        cur.execute("""
+            INSERT INTO company (source, hh_company_id, company_name, last_synced_at)
+            SELECT DISTINCT ON (source, hh_company_id)
+                source,
+                hh_company_id,
+                company_name,
+                now()
+            FROM vacancy_stage
+            ORDER BY source, hh_company_id
+            ON CONFLICT (source, hh_company_id) DO UPDATE
+            SET company_name = EXCLUDED.company_name,
+                last_synced_at = EXCLUDED.last_synced_at
+            """)
+
+        # Добавление новых и обновление изменившихся вакансий
+        cur.execute("""
+            INSERT INTO vacancy (source, hh_vacancy_id, hh_company_id, company_name, title, salary_from, salary_to,
+                currency, vacancy_url, description)
+            SELECT DISTINCT ON (source, hh_vacancy_id) *
+            FROM vacancy_stage
+            ORDER BY source, hh_vacancy_id
+            ON CONFLICT (source, hh_vacancy_id) DO UPDATE
+            SET hh_company_id = EXCLUDED.hh_company_id,
+                company_name = EXCLUDED.company_name,
+                title = EXCLUDED.title,
+                salary_from = EXCLUDED.salary_from,
+                salary_to = EXCLUDED.salary_to,
+                currency = EXCLUDED.currency,
+                vacancy_url = EXCLUDED.vacancy_url,
+                description = EXCLUDED.description,
+                is_archived = FALSE,
+                updated_at = now()
+            WHERE vacancy.is_archived
+                OR (vacancy.hh_company_id, vacancy.company_name, vacancy.title, vacancy.salary_from, vacancy.salary_to,
+                    vacancy.currency, vacancy.vacancy_url, vacancy.description)
+                IS DISTINCT FROM
+                    (EXCLUDED.hh_company_id, EXCLUDED.company_name, EXCLUDED.title, EXCLUDED.salary_from,
+                    EXCLUDED.salary_to, EXCLUDED.currency, EXCLUDED.vacancy_url, EXCLUDED.description)
             """)
 
-        conn.close()
+        # Компании, вакансии которых получены полностью (включая компании без вакансий в этой загрузке)
+        cur.execute("CREATE TEMP TABLE sync_company (source VARCHAR(20), hh_company_id INT) ON COMMIT DROP")
+        if companies is None:
+            cur.execute("INSERT INTO sync_company SELECT DISTINCT source, hh_company_id FROM vacancy_stage")
+        else:
+            rows = list({(source, int(company_id)) for source, company_id in companies})
+            if rows:
+                execute_values(cur, "INSERT INTO sync_company (source, hh_company_id) VALUES %s", rows)
 
-    def insert_data_to_db(self, vacancies_list: list[dict]) -> None:
-        """Заполнение БД данными с сайта hh.ru о компаниях и их вакансиях"""
+        # Вакансии этих компаний, которых нет в последней загрузке, помечаются архивными
+        cur.execute("""
+            UPDATE vacancy
+            SET is_archived = TRUE,
+                updated_at = now()
+            FROM sync_company
+            WHERE NOT vacancy.is_archived
+                AND vacancy.source = sync_company.source
+                AND vacancy.hh_company_id = sync_company.hh_company_id
+                AND NOT EXISTS (SELECT 1 FROM vacancy_stage
+                                WHERE vacancy_stage.source = vacancy.source
+                                    AND vacancy_stage.hh_vacancy_id = vacancy.hh_vacancy_id)
+            """)
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        conn.autocommit = True
+    @staticmethod
+    def _refresh_salary_stats(cur) -> None:
+        """Пересчет средней зарплаты вакансий в рублях ('salary_mid') и сводки 'salary_stats' (защищенный метод).
+        Перезаписываются только строки, у которых значение 'salary_mid' изменилось."""
+        cur.execute("""
+            UPDATE vacancy
+            SET salary_mid = normalized.salary_mid
+            FROM (
+                SELECT
+                    vacancy.id,
+                    ROUND(COALESCE(
+                        (NULLIF(vacancy.salary_from, 0) + NULLIF(vacancy.salary_to, 0)) / 2.0,
+                        NULLIF(vacancy.salary_from, 0),
+                        NULLIF(vacancy.salary_to, 0)) / currency_rate.rate, 2) AS salary_mid
+                FROM vacancy
+                LEFT JOIN currency_rate ON currency_rate.currency = vacancy.currency
+            ) AS normalized
+            WHERE normalized.id = vacancy.id AND vacancy.salary_mid IS DISTINCT FROM normalized.salary_mid;
 
-        # Цикл по вакансиям из списка 'vacancies_list', полученных от API hh.ru
-        for vacancy in vacancies_list:
+            REFRESH MATERIALIZED VIEW salary_stats;
+            """)
 
-            # Заполнение таблицы 'vacancy'
+    @staticmethod
+    def _create_snapshot_partition(cur) -> None:
+        """Создание секции таблицы 'vacancy_snapshot' для текущего месяца, если ее еще нет (защищенный метод)"""
+        cur.execute("SELECT date_trunc('month', now())::date, (date_trunc('month', now()) + interval '1 month')::date")
+        month_start, month_end = cur.fetchone()
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS vacancy_snapshot_{month_start:%Y_%m}
+            PARTITION OF vacancy_snapshot FOR VALUES FROM ('{month_start}') TO ('{month_end}')
+            """)
+
+    def _snapshot_vacancies(self, cur) -> None:
+        """Сохранение в историю ('vacancy_snapshot') вакансий, добавленных или изменившихся в текущей транзакции
+        (защищенный метод). Такие вакансии отмечены временем начала транзакции в столбце 'updated_at'."""
+        self._create_snapshot_partition(cur)
+        cur.execute("""
+            INSERT INTO vacancy_snapshot (source, hh_vacancy_id, fetched_at, change_type, hh_company_id, company_name,
+                title, salary_from, salary_to, currency, salary_mid)
+            SELECT
+                source,
+                hh_vacancy_id,
+                now(),
+                CASE
+                    WHEN is_archived THEN 'closed'
+                    WHEN first_seen_at = now() THEN 'opened'
+                    ELSE 'changed'
+                END,
+                hh_company_id,
+                company_name,
+                title,
+                salary_from,
+                salary_to,
+                currency,
+                salary_mid
+            FROM vacancy
+            WHERE updated_at = now()
+            ON CONFLICT DO NOTHING
+            """)
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def update_currency_rates(self, rates: dict[str, float]) -> None:
+        """Сохранение курсов валют (количество единиц валюты за 1 рубль, как в справочнике hh.ru)
+        и пересчет статистики зарплат по новым курсам"""
+        with self._connection() as conn, conn:  # Соединение из пула, изменения вносятся в одной транзакции
             with conn.cursor() as cur:
-                cur.execute(
-                    f"INSERT INTO vacancy (hh_vacancy_id, hh_company_id, company_name, title, salary_from, salary_to, currency, vacancy_url, description) "
-                    f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                    (vacancy["id"],
-                     vacancy["employer"]["id"],
-                     vacancy["employer"]["name"],
-                     vacancy["name"],
-                     vacancy.get("salary_range", {}).get("from", 0) if vacancy.get("salary_range") else 0,
-                     vacancy.get("salary_range", {}).get("to", 0) if vacancy.get("salary_range") else 0,
-                     vacancy.get("salary_range", {}).get("currency") if vacancy.get("salary_range") else "",
-                     vacancy["alternate_url"],
-                     vacancy["snippet"]["responsibility"])
-                )
+                cur.executemany("""
+                    INSERT INTO currency_rate (currency, rate) VALUES (%s, %s)
+                    ON CONFLICT (currency) DO UPDATE SET rate = EXCLUDED.rate
+                    """, [(currency, rate) for currency, rate in rates.items() if rate])
+                self._refresh_salary_stats(cur)
 
-        # Заполнение таблицы 'company' данными из таблицы 'vacancy'
-        with conn.cursor() as cur:
+        self._invalidate_cache()  # Средняя зарплата и зависящие от нее результаты изменились
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def insert_data_to_db(self, vacancies_list: list[dict | VacancyRecord], bulk: bool = True,
+                          page_size: int = 5000, companies: Iterable[tuple[str, int | str]] | None = None) -> None:
+        """Заполнение БД данными о компаниях и их вакансиях (в формате ответа API hh.ru
+        или в едином формате VacancyRecord).
+        При bulk=True вакансии загружаются командой COPY порциями по 'page_size' строк в одной транзакции,
+        при bulk=False - отдельной командой INSERT на каждую вакансию.
+        В инкрементальном режиме (incremental=True) данные всегда загружаются через COPY с последующим upsert,
+        а отсутствующие в загрузке вакансии компаний 'companies' (пары (источник, id компании))
+        помечаются архивными."""
+        batches = (vacancies_list[start:start + page_size] for start in range(0, len(vacancies_list), page_size))
+        self.insert_batches_to_db(batches, bulk, companies)
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def insert_batches_to_db(self, batches: Iterable[list[dict | VacancyRecord]], bulk: bool = True,
+                             companies: Iterable[tuple[str, int | str]] | None = None) -> None:
+        """Заполнение БД вакансиями, поступающими порциями (например, из генератора или очереди).
+        Каждая порция записывается в БД сразу после получения, все порции загружаются в одной транзакции.
+        companies - пары (источник, id компании), вакансии которых запрошены полностью: в инкрементальном режиме
+        их вакансии, отсутствующие в загрузке, помечаются архивными (None - компании из самой загрузки).
+        Перечисляются после загрузки всех порций."""
+        rows_amount = 0
+        start = time.perf_counter()
+
+        def count_rows(batches: Iterable[list]) -> Iterator[list]:
+            """Генератор порций вакансий с подсчетом количества загруженных строк (для метрик)"""
+            nonlocal rows_amount
+            for batch in batches:
+                rows_amount += len(batch)
+                yield batch
+
+        batches = count_rows(batches)
+
+        # Соединение из пула, все изменения вносятся в одной транзакции (при ошибке - откат)
+        with self._connection() as conn, conn:
+            with conn.cursor() as cur:
+                if self.incremental:
+                    self._upsert_vacancies(cur, batches, companies)
+                else:
+                    if bulk:
+                        self._copy_vacancies(cur, batches)
+                    else:
+                        # Цикл по вакансиям, полученным от API
+                        for vacancy in (vacancy for batch in batches for vacancy in batch):
+                            # Заполнение таблицы 'vacancy'
+                            cur.execute(
+                                "INSERT INTO vacancy (source, hh_vacancy_id, hh_company_id, company_name, title, "
+                                "salary_from, salary_to, currency, vacancy_url, description) "
+                                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                                self._vacancy_to_row(vacancy)
+                            )
+
+                    # Заполнение таблицы 'company' данными из таблицы 'vacancy'
+                    cur.execute("""
+                        INSERT INTO company (source, hh_company_id, company_name, last_synced_at)
+                        SELECT DISTINCT ON (source, hh_company_id)
+                            source,
+                            hh_company_id,
+                            company_name,
+                            now()
+                        FROM vacancy
+                        ORDER BY source, hh_company_id
+                        """)
+
+                self._refresh_salary_stats(cur)  # Пересчет статистики зарплат в той же транзакции
+                self._snapshot_vacancies(cur)  # Сохранение изменений в историю (с зарплатой в рублях)
+
+        self._invalidate_cache()  # Результаты запросов, сохраненные до загрузки, устарели
+
+        duration = time.perf_counter() - start
+        METRICS.inc("db_rows_inserted_total", rows_amount)
+        METRICS.set("db_insert_rows_per_second", rows_amount / duration if duration else 0)
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_vacancy_ids_to_enrich(self, limit: int | None = None) -> list[int]:
+        """Метод получения id (на hh.ru) актуальных вакансий, подробные данные о которых еще не загружены
+        или устарели (вакансия изменилась после загрузки подробных данных)"""
+
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
             cur.execute("""
-                INSERT INTO company (hh_company_id, company_name)
-                SELECT
-                    hh_company_id,
-                    company_name
+                SELECT hh_vacancy_id
                 FROM vacancy
-                GROUP BY hh_company_id, company_name
-                """)
+                WHERE source = 'hh' AND NOT is_archived
+                    AND (details_fetched_at IS NULL OR details_fetched_at < updated_at)
+                ORDER BY hh_vacancy_id
+                LIMIT %s
+            """, (limit,))
+            return [row[0] for row in cur]
 
-        # Добавление в таблицу 'vacancy' ссылки на внешний ключ 'hh_company_id' таблицы 'company'
-        with conn.cursor() as cur:
-            cur.execute("""
-                ALTER TABLE vacancy
-                ADD CONSTRAINT fk_hh_company_id
-                FOREIGN KEY (hh_company_id)
-                REFERENCES company(hh_company_id);
-                """)
+    @METRICS.timed("db_operation_duration_seconds")
+    def save_vacancy_details(self, details_list: list[dict]) -> None:
+        """Сохранение подробных данных о вакансиях (ответов API hh.ru по адресу /vacancies/{id}):
+        полного описания, требуемого опыта, графика работы и ключевых навыков"""
+        if not details_list:
+            return
+
+        vacancies = [(int(details["id"]),
+                      details.get("description"),
+                      details["experience"]["name"] if details.get("experience") else None,
+                      details["schedule"]["name"] if details.get("schedule") else None)
+                     for details in details_list]
+        vacancy_skills = [(int(details["id"]), skill["name"])
+                          for details in details_list for skill in details.get("key_skills", [])]
+
+        with self._connection() as conn, conn:  # Соединение из пула, изменения вносятся в одной транзакции
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    UPDATE vacancy
+                    SET full_description = details.full_description,
+                        experience = details.experience,
+                        schedule = details.schedule,
+                        details_fetched_at = now()
+                    FROM (VALUES %s) AS details (hh_vacancy_id, full_description, experience, schedule)
+                    WHERE vacancy.source = 'hh' AND vacancy.hh_vacancy_id = details.hh_vacancy_id
+                    """, vacancies)
 
-        conn.close()
+                # Навыки вакансий полностью заменяются актуальным списком
+                cur.execute("""
+                    DELETE FROM vacancy_skill
+                    USING vacancy
+                    WHERE vacancy_skill.vacancy_id = vacancy.id
+                        AND vacancy.source = 'hh' AND vacancy.hh_vacancy_id = ANY(%s)
+                    """, ([vacancy[0] for vacancy in vacancies],))
+                if vacancy_skills:
+                    execute_values(cur, """
+                        INSERT INTO skill (skill_name) VALUES %s ON CONFLICT (skill_name) DO NOTHING
+                        """, sorted({(skill_name,) for _, skill_name in vacancy_skills}))
+                    execute_values(cur, """
+                        INSERT INTO vacancy_skill (vacancy_id, skill_id)
+                        SELECT vacancy.id, skill.id
+                        FROM (VALUES %s) AS vacancy_skills (hh_vacancy_id, skill_name)
+                        JOIN vacancy ON vacancy.source = 'hh' AND vacancy.hh_vacancy_id = vacancy_skills.hh_vacancy_id
+                        JOIN skill ON skill.skill_name = vacancy_skills.skill_name
+                        ON CONFLICT DO NOTHING
+                        """, vacancy_skills)
 
-    def get_companies_list(self) -> list[str]:
-        """Метод получения списка всех компаний с количеством вакансий у каждой компании"""
+        self._invalidate_cache()
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        with conn.cursor() as cur:
+    @METRICS.timed("db_operation_duration_seconds")
+    def mark_vacancy_details_unavailable(self, vacancy_ids: list[int]) -> None:
+        """Отметка вакансий (id на hh.ru), подробные данные о которых получить нельзя (вакансия удалена):
+        такие вакансии не запрашиваются повторно, пока не изменятся"""
+        if not vacancy_ids:
+            return
+
+        with self._connection() as conn, conn:  # Соединение из пула, изменения вносятся в одной транзакции
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE vacancy
+                    SET details_fetched_at = now()
+                    WHERE source = 'hh' AND hh_vacancy_id = ANY(%s)
+                    """, (list(vacancy_ids),))
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_companies_list(self) -> list[Company]:
+        """Метод получения списка всех компаний с количеством вакансий у каждой компании (результат кешируется)"""
+        return list(self._cached(("companies",), self._load_companies_list))
+
+    def _load_companies_list(self) -> tuple[Company, ...]:
+        """Выполнение запроса списка компаний для метода 'get_companies_list' (защищенный метод)"""
+
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
             cur.execute("""
                 SELECT 
+                    company.source,
                     company.hh_company_id, 
                     company.company_name, 
                     COUNT(vacancy.hh_vacancy_id) AS vacancies_amount
                 FROM company
-                LEFT JOIN vacancy ON company.hh_company_id = vacancy.hh_company_id
-                GROUP BY company.hh_company_id, company.company_name
+                LEFT JOIN vacancy ON company.source = vacancy.source AND company.hh_company_id = vacancy.hh_company_id
+                    AND NOT vacancy.is_archived
+                GROUP BY company.source, company.hh_company_id, company.company_name
                 ORDER BY vacancies_amount DESC
             """)
-            result = cur.fetchall()
+            return tuple(map(Company._make, cur))
 
-        # Преобразование результата в список строк для последующего вывода в консоль
-        companies = []
-        for row in result:
-            companies.append(f"id компании на hh.ru: {row[0]}. Название компании: {row[1]}. Количество вакансий на hh.ru: {row[2]}.\n")
-
-        conn.close()
-        return companies
+    def iter_vacancies_list(self) -> Iterator[Vacancy]:
+        """
+        Генератор всех вакансий с указанием названия компании, названия вакансии,
+        зарплаты и ссылки на вакансию (строки читаются из БД порциями, без загрузки всего результата в память).
+        """
+        rows = self._iter_rows("""
+            SELECT 
+                vacancy.id,
+                vacancy.source,
+                vacancy.company_name, 
+                vacancy.title,
+                vacancy.salary_from,
+                vacancy.salary_to,
+                vacancy.currency,
+                vacancy.vacancy_url 
+            FROM vacancy
+            LEFT JOIN company ON company.source = vacancy.source AND company.hh_company_id = vacancy.hh_company_id
+            WHERE NOT vacancy.is_archived
+        """)
+        return map(Vacancy._make, rows)
 
-    def get_vacancies_list(self) -> list[str]:
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_vacancies_list(self) -> list[Vacancy]:
         """
         Метод получения списка всех вакансий с указанием названия компании, названия вакансии,
         зарплаты и ссылки на вакансию.
         """
+        return list(self.iter_vacancies_list())
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        with conn.cursor() as cur:
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_vacancies_page(self, after_id: int = 0, limit: int = 100) -> tuple[list[Vacancy], int | None]:
+        """
+        Метод получения одной страницы вакансий (постраничный вывод по ключу: WHERE id > after_id).
+        Возвращает список вакансий (не более 'limit') и значение 'after_id' для следующей страницы
+        (None, если страница последняя).
+        """
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
             cur.execute("""
                 SELECT 
+                    vacancy.id,
+                    vacancy.source,
                     vacancy.company_name, 
                     vacancy.title,
                     vacancy.salary_from,
                     vacancy.salary_to,
                     vacancy.currency,
-                    vacancy.vacancy_url 
+                    vacancy.vacancy_url
                 FROM vacancy
-                LEFT JOIN company ON company.hh_company_id = vacancy.hh_company_id
-            """)
-            result = cur.fetchall()
-
-        # Преобразование результата в список строк для последующего вывода в консоль
-        vacancies = []
-        for row in result:
-            vacancies.append(f"Название компании: {row[0]}.\n"
-                             f"Требуется: {row[1]}.\n"
-                             f"Зарплата от {row[2] if row[2] else 0} до {row[3] if row[3] else 0} {row[4]}.\n"
-                             f"Ссылка на вакансию: {row[5]}.\n")
+                WHERE NOT vacancy.is_archived AND vacancy.id > %s
+                ORDER BY vacancy.id
+                LIMIT %s
+            """, (after_id, limit))
+            vacancies = list(map(Vacancy._make, cur))
 
-        conn.close()
-        return vacancies
+        next_after_id = vacancies[-1].id if len(vacancies) == limit else None
+        return vacancies, next_after_id
 
+    @METRICS.timed("db_operation_duration_seconds")
     def get_avg_salary(self) -> int:
-        """Метод получения средней зарплаты по всем вакансиям"""
+        """Метод получения средней зарплаты (в рублях) по всем вакансиям с указанной зарплатой
+        (результат кешируется)"""
+        return self._cached(("avg_salary",), self._load_avg_salary)
+
+    def _load_avg_salary(self) -> int:
+        """Выполнение запроса средней зарплаты для метода 'get_avg_salary' (защищенный метод)"""
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        with conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
             cur.execute("""
-                SELECT AVG(
-                    COALESCE(
-                        (salary_from + salary_to) / 2,
-                        salary_from,
-                        salary_to,
-                        0))
-                FROM vacancy;
+                SELECT avg_salary
+                FROM salary_stats
+                WHERE hh_company_id IS NULL;
             """)
             result = cur.fetchone()
 
-        conn.close()
         return round(result[0]) if result and result[0] is not None else 0
 
-    def get_vacancies_list_with_higher_salary(self) -> list[str]:
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_salary_stats(self) -> list[SalaryStats]:
+        """Метод получения статистики зарплат (в рублях) по каждой компании: средняя, медиана, 25/75/90-й процентили"""
+
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
+            cur.execute("""
+                SELECT 
+                    company.company_name,
+                    salary_stats.vacancies_amount,
+                    salary_stats.avg_salary,
+                    salary_stats.median_salary,
+                    salary_stats.p25_salary,
+                    salary_stats.p75_salary,
+                    salary_stats.p90_salary
+                FROM salary_stats
+                JOIN company
+                    ON company.source = salary_stats.source AND company.hh_company_id = salary_stats.hh_company_id
+                ORDER BY salary_stats.median_salary DESC
+            """)
+            return list(map(SalaryStats._make, cur))
+
+    def iter_vacancies_list_with_higher_salary(self) -> Iterator[Vacancy]:
+        """
+        Генератор всех вакансий, у которых зарплата выше средней по всем вакансиям
+        (с указанием названия компании, названия вакансии, зарплаты и ссылки на вакансию).
+        Зарплаты сравниваются в рублях, вакансии отсортированы по убыванию зарплаты.
+        """
+        rows = self._iter_rows("""
+            SELECT 
+                vacancy.id,
+                vacancy.source,
+                vacancy.company_name, 
+                vacancy.title,
+                vacancy.salary_from,
+                vacancy.salary_to,
+                vacancy.currency,
+                vacancy.vacancy_url 
+            FROM vacancy
+            WHERE NOT vacancy.is_archived
+                AND vacancy.salary_mid > (SELECT avg_salary FROM salary_stats WHERE hh_company_id IS NULL)
+            ORDER BY vacancy.salary_mid DESC
+        """)
+        return map(Vacancy._make, rows)
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_vacancies_list_with_higher_salary(self) -> list[Vacancy]:
         """
         Метод получения списка всех вакансий, у которых зарплата выше средней по всем вакансиям
         (с указанием названия компании, названия вакансии, зарплаты и ссылки на вакансию).
+        Результат кешируется до следующего изменения данных, если в нем не больше 'cache_max_rows' вакансий
+        (для вывода всех вакансий без хранения в памяти используется метод 'iter_vacancies_list_with_higher_salary').
         """
+        return list(self._cached(("higher_salary",),
+                                 lambda: tuple(self.iter_vacancies_list_with_higher_salary())))
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT 
-                    vacancy.company_name, 
-                    vacancy.title,
-                    vacancy.salary_from,
-                    vacancy.salary_to,
-                    vacancy.currency,
-                    vacancy.vacancy_url 
-                FROM vacancy
-                WHERE vacancy.salary_from > (SELECT AVG(
-                    COALESCE(
-                        (salary_from + salary_to) / 2,
-                        salary_from,
-                        salary_to,
-                        0))
-                FROM vacancy) OR vacancy.salary_to > (SELECT AVG(
-                    COALESCE(
-                        (salary_from + salary_to) / 2,
-                        salary_from,
-                        salary_to,
-                        0))
-                FROM vacancy)
-                ORDER BY vacancy.salary_from DESC
-            """)
-            result = cur.fetchall()
+    @staticmethod
+    def _to_tsquery(keyword: str) -> str:
+        """Преобразование поискового запроса в выражение tsquery (защищенный метод).
+        Все слова запроса должны присутствовать в вакансии,
+        каждое слово ищется как префикс ('pyth' найдет 'python')."""
+        return " & ".join(f"{word}:*" for word in re.findall(r"\w+", keyword))
 
-        # Преобразование результата в список строк для последующего вывода в консоль
-        vacancies = []
-        for row in result:
-            vacancies.append(f"Название компании: {row[0]}.\n"
-                             f"Требуется: {row[1]}.\n"
-                             f"Зарплата от {row[2] if row[2] else 0} до {row[3] if row[3] else 0} {row[4]}.\n"
-                             f"Ссылка на вакансию: {row[5]}.\n")
+    @staticmethod
+    def _like_pattern(keyword: str) -> str:
+        """Преобразование подстроки в шаблон для поиска оператором LIKE/ILIKE (защищенный метод).
+        Символы '%', '_' и '\\' в подстроке экранируются (обратная косая черта - символ экранирования
+        LIKE по умолчанию), поэтому ищутся как обычные символы."""
+        return "%" + re.sub(r"([%_\\])", r"\\\1", keyword) + "%"
 
-        conn.close()
-        return vacancies
+    def iter_vacancies_list_by_keyword(self, keyword: str, limit: int | None = None,
+                                       offset: int = 0) -> Iterator[Vacancy]:
+        """
+        Генератор всех вакансий, у которых в названии или в описании есть ключевые слова
+        (с указанием названия компании, названия вакансии, зарплаты и ссылки на вакансию).
+        Используется полнотекстовый поиск: вакансии отсортированы по релевантности (ts_rank),
+        limit и offset задают размер и смещение страницы результатов.
+        """
+        query = self._to_tsquery(keyword)
+        if not query:  # В запросе нет ни одного слова
+            return iter(())
 
-    def get_vacancies_list_by_keyword(self, keyword: str) -> list[str]:
+        # При наличии триграммного индекса дополнительно ищется подстрока в названии вакансии
+        substring_condition = "OR vacancy.title ILIKE %(pattern)s" if self.trigram_search else ""
+
+        rows = self._iter_rows(f"""
+            WITH search AS (
+                SELECT to_tsquery('russian', %(query)s) || to_tsquery('english', %(query)s) AS query
+            )
+            SELECT 
+                vacancy.id,
+                vacancy.source,
+                vacancy.company_name, 
+                vacancy.title,
+                vacancy.salary_from,
+                vacancy.salary_to,
+                vacancy.currency,
+                vacancy.vacancy_url 
+            FROM vacancy, search
+            WHERE NOT vacancy.is_archived
+                AND (vacancy.search_vector @@ search.query {substring_condition})
+            ORDER BY ts_rank(vacancy.search_vector, search.query) DESC, vacancy.salary_from DESC NULLS LAST
+            LIMIT %(limit)s OFFSET %(offset)s
+        """, {"query": query, "pattern": self._like_pattern(keyword), "limit": limit, "offset": offset})
+        return map(Vacancy._make, rows)
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_vacancies_list_by_keyword(self, keyword: str, limit: int | None = None, offset: int = 0) -> list[Vacancy]:
         """
         Метод получения списка всех вакансий, у которых в названии или в описании есть ключевые слова
         (с указанием названия компании, названия вакансии, зарплаты и ссылки на вакансию).
+        Вакансии отсортированы по релевантности, limit и offset задают размер и смещение страницы результатов.
+        Результат кешируется до следующего изменения данных, если в нем не больше 'cache_max_rows' вакансий.
         """
+        return list(self._cached(("keyword", keyword, limit, offset),
+                                 lambda: tuple(self.iter_vacancies_list_by_keyword(keyword, limit, offset))))
 
-        conn = psycopg2.connect(dbname=self.db_name, **self.params)  # Подключение к ранее созданной БД
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT 
-                    vacancy.company_name, 
-                    vacancy.title,
-                    vacancy.salary_from,
-                    vacancy.salary_to,
-                    vacancy.currency,
-                    vacancy.vacancy_url 
-                FROM vacancy
-                WHERE vacancy.title ILIKE %s OR vacancy.description ILIKE %s 
-                ORDER BY vacancy.salary_from DESC
-            """, (f'%{keyword}%', f'%{keyword}%')
-                        )
-            result = cur.fetchall()
-
-        # Преобразование результата в список строк для последующего вывода в консоль
-        vacancies = []
-        for row in result:
-            vacancies.append(f"Название компании: {row[0]}.\n"
-                             f"Требуется: {row[1]}.\n"
-                             f"Зарплата от {row[2] if row[2] else 0} до {row[3] if row[3] else 0} {row[4]}.\n"
-                             f"Ссылка на вакансию (на hh.ru): {row[5]}.\n")
-
-        conn.close()
-        return vacancies
+    @staticmethod
+    def _check_period(period: str) -> None:
+        """Проверка периода группировки данных истории вакансий (защищенный метод)"""
+        if period not in ("day", "week", "month", "quarter", "year"):
+            raise ValueError("Период должен быть одним из значений: 'day', 'week', 'month', 'quarter', 'year'.")
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_salary_trend(self, keyword: str | None = None, company_id: int | None = None, source: str = "hh",
+                         since: datetime | None = None, period: str = "month") -> list[SalaryTrend]:
+        """
+        Метод получения динамики зарплат (в рублях) по периодам на основе истории вакансий.
+        Учитываются вакансии, опубликованные или изменившие условия в периоде (последнее состояние вакансии
+        в периоде). keyword - подстрока в названии вакансии, company_id - id компании в источнике 'source',
+        since - начало интервала (читаются только секции истории начиная с этой даты).
+        """
+        self._check_period(period)
+        conditions = "AND fetched_at >= %(since)s" if since else ""
+        if keyword:
+            conditions += " AND title ILIKE %(pattern)s"
+        if company_id is not None:
+            conditions += " AND source = %(source)s AND hh_company_id = %(company_id)s"
 
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
+            cur.execute(f"""
+                WITH period_state AS (
+                    SELECT DISTINCT ON (source, hh_vacancy_id, date_trunc(%(period)s, fetched_at))
+                        date_trunc(%(period)s, fetched_at) AS period,
+                        salary_mid
+                    FROM vacancy_snapshot
+                    WHERE change_type <> 'closed' {conditions}
+                    ORDER BY source, hh_vacancy_id, date_trunc(%(period)s, fetched_at), fetched_at DESC
+                )
+                SELECT
+                    period,
+                    COUNT(*) AS vacancies_amount,
+                    ROUND(AVG(salary_mid)) AS avg_salary,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY salary_mid) AS median_salary
+                FROM period_state
+                WHERE salary_mid IS NOT NULL
+                GROUP BY period
+                ORDER BY period
+            """, {"period": period, "since": since, "pattern": self._like_pattern(keyword) if keyword else None,
+                  "source": source, "company_id": company_id})
+            return list(map(SalaryTrend._make, cur))
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_openings_by_company(self, since: datetime | None = None, period: str = "month") -> list[CompanyOpenings]:
+        """Метод получения количества открытых и закрытых вакансий каждой компании по периодам
+        (since - начало интервала, читаются только секции истории начиная с этой даты)"""
+        self._check_period(period)
+        since_condition = "AND fetched_at >= %(since)s" if since else ""
+
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
+            cur.execute(f"""
+                SELECT
+                    date_trunc(%(period)s, fetched_at) AS period,
+                    MAX(company_name) AS company_name,
+                    COUNT(*) FILTER (WHERE change_type = 'opened') AS opened,
+                    COUNT(*) FILTER (WHERE change_type = 'closed') AS closed
+                FROM vacancy_snapshot
+                WHERE change_type IN ('opened', 'closed') {since_condition}
+                GROUP BY date_trunc(%(period)s, fetched_at), source, hh_company_id
+                ORDER BY period, opened DESC
+            """, {"period": period, "since": since})
+            return list(map(CompanyOpenings._make, cur))
+
+    @METRICS.timed("db_operation_duration_seconds")
+    def get_time_to_close(self, since: datetime | None = None) -> list[TimeToClose]:
+        """Метод получения времени закрытия вакансий (в днях от первой загрузки вакансии до ее закрытия) по компаниям
+        (since - начало интервала по дате закрытия, читаются только секции истории начиная с этой даты)"""
+        since_condition = "AND vacancy_snapshot.fetched_at >= %(since)s" if since else ""
+
+        with self._connection() as conn, conn.cursor() as cur:  # Соединение из пула
+            cur.execute(f"""
+                WITH closed AS (
+                    SELECT
+                        vacancy_snapshot.source,
+                        vacancy_snapshot.hh_company_id,
+                        vacancy_snapshot.company_name,
+                        EXTRACT(EPOCH FROM vacancy_snapshot.fetched_at - vacancy.first_seen_at) / 86400 AS days_open
+                    FROM vacancy_snapshot
+                    JOIN vacancy ON vacancy.source = vacancy_snapshot.source
+                        AND vacancy.hh_vacancy_id = vacancy_snapshot.hh_vacancy_id
+                    WHERE vacancy_snapshot.change_type = 'closed' {since_condition}
+                )
+                SELECT
+                    MAX(company_name) AS company_name,
+                    COUNT(*) AS closed_amount,
+                    ROUND(AVG(days_open), 1) AS avg_days,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY days_open) AS median_days
+                FROM closed
+                GROUP BY source, hh_company_id
+                ORDER BY median_days
+            """, {"since": since})
+            return list(map(TimeToClose._make, cur))
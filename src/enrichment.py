@@ -0,0 +1,39 @@
+import sys
+import time
+
+from src.db_manager import DBManager
+from src.hh_api import HeadHunterAPI
+
+
+def enrich_vacancies(hh_api: HeadHunterAPI, data_base: DBManager, batch_size: int = 100,
+                     limit: int | None = None) -> int:
+    """Функция загрузки подробных данных о новых и изменившихся вакансиях (запросы к API по адресу /vacancies/{id}).
+    Данные сохраняются в БД порциями по 'batch_size' вакансий, после каждой порции в stderr выводится прогресс
+    и скорость загрузки. Удаленные с hh.ru вакансии отмечаются в БД, чтобы не запрашивать их повторно.
+    При работе без обращения к API вакансии, данных о которых нет в кеше, пропускаются (выводится их количество).
+    Возвращает количество вакансий, подробные данные о которых были сохранены."""
+    vacancy_ids = data_base.get_vacancy_ids_to_enrich(limit)
+    if not vacancy_ids:
+        return 0
+
+    print(f"Загрузка подробных данных о вакансиях: {len(vacancy_ids)} шт.", file=sys.stderr)
+    started_at = time.perf_counter()
+    saved = 0
+    missing = []  # id вакансий, данных о которых нет в кеше (при работе без обращения к API)
+
+    for start in range(0, len(vacancy_ids), batch_size):
+        unavailable = []  # id вакансий, удаленных с hh.ru
+        batch = vacancy_ids[start:start + batch_size]
+        details_list = list(hh_api.iter_vacancy_details(batch, unavailable, missing))
+        data_base.save_vacancy_details(details_list)
+        data_base.mark_vacancy_details_unavailable(unavailable)
+        saved += len(details_list)
+
+        elapsed = time.perf_counter() - started_at
+        print(f"Обработано {min(start + batch_size, len(vacancy_ids))} из {len(vacancy_ids)} вакансий, "
+              f"сохранено {saved} ({saved / elapsed:.1f} вакансий/с)", file=sys.stderr)
+
+    if missing:
+        print(f"Нет сохраненных ответов API с подробными данными о {len(missing)} вакансиях "
+              f"(работа без обращения к API): они будут загружены при следующей синхронизации.", file=sys.stderr)
+    return saved
@@ -0,0 +1,60 @@
+import csv
+import json
+import sys
+from collections.abc import Iterable
+from itertools import islice
+from typing import NamedTuple, TextIO
+
+FORMATS = ("jsonl", "csv", "parquet")  # Поддерживаемые форматы выгрузки
+
+
+def _write_jsonl(rows: Iterable[NamedTuple], stream: TextIO) -> None:
+    """Выгрузка строк в формате JSON Lines (один JSON-объект на строку)"""
+    for row in rows:
+        stream.write(json.dumps(row._asdict(), ensure_ascii=False, default=str))
+        stream.write("\n")
+
+
+def _write_csv(rows: Iterable[NamedTuple], stream: TextIO) -> None:
+    """Выгрузка строк в формате CSV (заголовок - названия полей первой строки)"""
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.writer(stream)
+            writer.writerow(row._fields)
+        writer.writerow(row)
+
+
+def _write_parquet(rows: Iterable[NamedTuple], stream: TextIO, batch_size: int) -> None:
+    """Выгрузка строк в формате Parquet группами по 'batch_size' строк (требуется библиотека pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Для выгрузки в формате Parquet необходимо установить библиотеку pyarrow.")
+
+    rows = iter(rows)
+    writer = None
+    try:
+        while batch := list(islice(rows, batch_size)):
+            table = pa.Table.from_pylist([row._asdict() for row in batch])
+            if writer is None:
+                writer = pq.ParquetWriter(stream.buffer, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_rows(rows: Iterable[NamedTuple], output_format: str, stream: TextIO = sys.stdout,
+                batch_size: int = 10000) -> None:
+    """Функция выгрузки результатов запросов к БД (Vacancy, Company и т.п.) в поток 'stream' в формате 'output_format'.
+    Строки записываются по мере поступления, поэтому расход памяти не зависит от объема выгрузки."""
+    if output_format == "jsonl":
+        _write_jsonl(rows, stream)
+    elif output_format == "csv":
+        _write_csv(rows, stream)
+    elif output_format == "parquet":
+        _write_parquet(rows, stream, batch_size)
+    else:
+        raise ValueError(f"Неизвестный формат выгрузки '{output_format}'. Доступные форматы: {', '.join(FORMATS)}.")
@@ -0,0 +1,49 @@
+import json
+
+from src.base_job_api import JobAPI, register_provider
+from src.models import VacancyRecord
+
+
+@register_provider
+class FileJobAPI(JobAPI):
+    """Класс для загрузки вакансий из локального JSON-файла (например, подготовленной выгрузки или тестовых данных).
+    Файл содержит список вакансий с полями VacancyRecord; поле 'source' можно не указывать."""
+    source = "file"  # Название источника вакансий (по умолчанию)
+
+    def __init__(self, path: str) -> None:
+        """Метод-конструктор для инициализации экземпляров класса FileJobAPI. path - путь к JSON-файлу с вакансиями."""
+        self.path = path
+
+    def _connect(self, params):
+        """Метод чтения вакансий из файла (защищенный). Возвращает список словарей."""
+        if not isinstance(params, dict):
+            raise ValueError("Неверный тип данных у атрибута 'params'.")
+
+        with open(self.path, encoding="utf-8") as file:
+            vacancies = json.load(file)
+        if not isinstance(vacancies, list):
+            raise ValueError(f"Файл '{self.path}' должен содержать список вакансий.")
+        return vacancies
+
+    @staticmethod
+    def normalize(vacancy: dict) -> VacancyRecord:
+        """Метод преобразования вакансии из файла в единый формат VacancyRecord"""
+        return VacancyRecord(vacancy.get("source", FileJobAPI.source),
+                             int(vacancy["vacancy_id"]),
+                             int(vacancy["company_id"]),
+                             vacancy["company_name"],
+                             vacancy["title"],
+                             vacancy.get("salary_from") or 0,
+                             vacancy.get("salary_to") or 0,
+                             vacancy.get("currency") or "",
+                             vacancy["vacancy_url"],
+                             vacancy.get("description"))
+
+    def get_vacancies(self, company_ids: list[str] | None = None) -> list[dict]:
+        """Метод получения вакансий из файла по id организаций (None - все вакансии из файла)"""
+        vacancies = self._connect({})
+        if company_ids is None:
+            return vacancies
+
+        company_ids = {str(company_id) for company_id in company_ids}
+        return [vacancy for vacancy in vacancies if str(vacancy["company_id"]) in company_ids]
@@ -1,52 +1,107 @@
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlparse
+
 import requests
 
-from src.base_job_api import JobAPI
+from src.base_job_api import register_provider
+from src.http_client import APIResponseError, CacheMissError, HTTPJobAPI
+from src.models import VacancyRecord
 
 
-class HeadHunterAPI(JobAPI):
+@register_provider
+class HeadHunterAPI(HTTPJobAPI):
     """Класс для поиска вакансий на платформе hh.ru"""
+    source = "hh"  # Название источника вакансий
     VACANCIES_URL = "https://api.hh.ru/vacancies"  # URL для поиска вакансий
+    DICTIONARIES_URL = "https://api.hh.ru/dictionaries"  # URL справочников hh.ru (в т.ч. курсов валют)
+    MAX_DEPTH = 2000  # Максимальное количество вакансий, которое hh.ru отдает по одному поисковому запросу
+    # Кластеры hh.ru (в порядке предпочтения), по которым выдача больше MAX_DEPTH вакансий разбивается на части
+    SPLIT_CLUSTERS = ("area", "professional_role")
 
     page: int  # Количество вакансий для поиска (по умолчанию 100)
     params: dict  # Параметры для GET-запроса по API hh.ru
 
-    def __init__(self) -> None:
-        """Метод-конструктор для инициализации экземпляров класса HeadHunterAPI. Определение значений атрибутов экземпляров."""
-        self.__session = None  # На начало работы программы ответа от сервера еще нет
+    @staticmethod
+    def normalize(vacancy: dict) -> VacancyRecord:
+        """Метод преобразования вакансии из ответа API hh.ru в единый формат VacancyRecord"""
+        salary_range = vacancy.get("salary_range")
+        return VacancyRecord("hh",
+                             int(vacancy["id"]),
+                             int(vacancy["employer"]["id"]),
+                             vacancy["employer"]["name"],
+                             vacancy["name"],
+                             salary_range.get("from", 0) if salary_range else 0,
+                             salary_range.get("to", 0) if salary_range else 0,
+                             salary_range.get("currency") if salary_range else "",
+                             vacancy["alternate_url"],
+                             vacancy["snippet"]["responsibility"])
+
+    def get_currency_rates(self) -> dict[str, float]:
+        """Метод получения курсов валют из справочника hh.ru.
+        Возвращает словарь {код валюты: количество единиц валюты за 1 рубль} (например, {"RUR": 1, "USD": 0.0125})."""
+        result = self._connect({}, url=self.DICTIONARIES_URL)
+        return {currency["code"]: currency["rate"] for currency in result.get("currency", [])}
 
-    def _connect(self, params):
-        """Метод подключения к API (защищенный)"""
-        # Валидация данных перед выполнением GET-запроса
-        if not isinstance(params, dict):
-            raise ValueError("Неверный тип данных у атрибута 'params'.")
+    def _get_page(self, company_id: str, page_number: int, per_page: int, filters: dict | None = None) -> dict:
+        """Метод получения одной страницы с вакансиями компании (защищенный).
+        filters - дополнительные параметры поискового запроса (например, {"area": "1"}).
+        Возвращает ответ API в формате JSON (вакансии в ключе "items", количество страниц в ключе "pages",
+        количество найденных вакансий в ключе "found")."""
+        params = {
+            "employer_id": company_id,
+            "per_page": per_page,
+            "page": page_number,
+            **(filters if filters else {}),
+        }
+        return self._connect(params)
 
-        with requests.Session() as self.__session:  # Для закрытия сессии после завершения работы с ней
-            response = self.__session.get(self.VACANCIES_URL,
-                                          params=params)  # API-запрос на получение информации по вакансиям от hh.ru
+    def _split_query(self, company_id: str, per_page: int, filters: dict, found: int) -> list[dict] | None:
+        """Метод разбиения поискового запроса, по которому найдено больше MAX_DEPTH вакансий, на части
+        по кластерам hh.ru (защищенный). Возвращает параметры запроса для каждой части или None, если запрос
+        разбить нельзя (подходящие кластеры уже использованы или не охватывают все найденные вакансии)."""
+        result = self._get_page(company_id, 0, per_page, {**filters, "clusters": "true"})
+        clusters = {cluster.get("id"): cluster for cluster in result.get("clusters") or []}
 
-            if response.status_code != 200:  # Если запрос неудачный...
-                raise ValueError(
-                    f"Неудачная попытка API-запроса по адресу '{self.VACANCIES_URL}'. Возможная причина: "
-                    f"{response.reason}.")
+        for cluster_id in self.SPLIT_CLUSTERS:
+            if cluster_id in filters or cluster_id not in clusters:
+                continue
 
-            return response  # Возврат ответа от API, если запрос удачный
+            # Значение параметра запроса для каждого элемента кластера берется из адреса элемента ("url")
+            parts = []
+            for item in clusters[cluster_id].get("items", []):
+                values = parse_qs(urlparse(item.get("url", "")).query).get(cluster_id)
+                if values and item.get("count"):
+                    parts.append(({**filters, cluster_id: values[0]}, item["count"]))
 
-    def get_vacancies(self, company_ids: list[str], page=100) -> list[dict] | None:
-        """Метод получения вакансий по id организаций (на hh.ru).
-        Принимает список id номеров компаний.
-        Возвращает список словарей с данными о вакансиях."""
-        if not isinstance(company_ids, list):
-            raise TypeError("Неверный тип данных у параметров запроса вакансий.")
+            if len(parts) > 1 and sum(count for _, count in parts) >= found:
+                return [part_filters for part_filters, _ in parts]
 
-        # Параметры GET-запроса
-        params = {
-            "employer_id": company_ids,
-            "per_page": page,
-        }
-        result = self._connect(params).json()  # Преобразование ответа от API в формат JSON
+        return None
 
-        # Возврат содержимого ключа "items" (только список словарей с вакансиями без вспомогательной информации)
-        return result.get("items", [])
+    def iter_vacancy_details(self, vacancy_ids: list[int], unavailable: list[int] | None = None,
+                             missing: list[int] | None = None) -> Iterator[dict]:
+        """Генератор подробных данных о вакансиях (полное описание, ключевые навыки, опыт, график работы).
+        Запросы к API выполняются параллельно (не более 'max_workers' одновременно) с учетом ограничения
+        частоты запросов, данные возвращаются по мере получения. Вакансии, данные о которых получить не удалось,
+        пропускаются (сообщения об ошибках выводятся в stderr); id удаленных вакансий (ответ 404 или 410)
+        добавляются в список 'unavailable', а id вакансий, данных о которых нет в кеше при работе
+        без обращения к API, - в список 'missing' (без отдельного сообщения о каждой вакансии)."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._connect, {}, f"{self.VACANCIES_URL}/{vacancy_id}"): vacancy_id
+                       for vacancy_id in vacancy_ids}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except (ValueError, requests.RequestException) as error:
+                    if isinstance(error, CacheMissError) and missing is not None:
+                        missing.append(futures[future])
+                        continue
+                    if isinstance(error, APIResponseError) and error.status_code in (404, 410) \
+                            and unavailable is not None:
+                        unavailable.append(futures[future])
+                    print(f"Не удалось получить данные о вакансии {futures[future]}: {error}", file=sys.stderr)
 
 
 # ###################################################################################################
@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+
+class CacheEntry(NamedTuple):
+    """Сохраненный ответ API"""
+    body: bytes  # Тело ответа
+    etag: str | None  # Значение заголовка 'ETag' (для запроса с 'If-None-Match')
+    last_modified: str | None  # Значение заголовка 'Last-Modified' (для запроса с 'If-Modified-Since')
+    fetched_at: float  # Время получения (или последней успешной проверки) ответа
+
+
+class ResponseCache:
+    """Класс для хранения ответов API в файле SQLite со сроком актуальности (TTL) и вытеснением по LRU"""
+
+    def __init__(self, path: str = "hh_cache.sqlite3", ttl: float = 3600, max_size: int = 100 * 1024 * 1024) -> None:
+        """Метод-конструктор для инициализации экземпляров класса ResponseCache.
+        path - путь к файлу кеша, ttl - время (в секундах), в течение которого ответ используется без обращения к API,
+        max_size - максимальный суммарный размер сохраненных ответов (в байтах)."""
+        self.ttl = ttl
+        self.max_size = max_size
+
+        # Одно соединение на все потоки, доступ к нему через блокировку
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__conn:
+            self.__conn.execute("""
+                CREATE TABLE IF NOT EXISTS response
+                (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_response_accessed_at ON response (accessed_at)")
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Метод проверки, что сохраненный ответ еще актуален (не старше 'ttl')"""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Метод получения сохраненного ответа по ключу (None, если ответа нет)"""
+        with self.__lock, self.__conn:
+            row = self.__conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM response WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            self.__conn.execute("UPDATE response SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return CacheEntry(*row)
+
+    def set(self, key: str, body: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        """Метод сохранения ответа. При превышении 'max_size' удаляются давно не использованные ответы."""
+        now = time.time()
+        with self.__lock, self.__conn:
+            self.__conn.execute("""
+                INSERT INTO response (key, body, etag, last_modified, fetched_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE
+                SET body = excluded.body,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at,
+                    size = excluded.size
+            """, (key, body, etag, last_modified, now, now, len(body)))
+            self._evict()
+
+    def touch(self, key: str) -> None:
+        """Метод продления актуальности ответа (сервер подтвердил, что данные не изменились)"""
+        with self.__lock, self.__conn:
+            self.__conn.execute("UPDATE response SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+    def clear(self) -> None:
+        """Метод удаления всех сохраненных ответов"""
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM response")
+
+    def close(self) -> None:
+        """Метод закрытия файла кеша"""
+        with self.__lock:
+            self.__conn.close()
+
+    def _evict(self) -> None:
+        """Удаление давно не использованных ответов сверх 'max_size' (защищенный метод, вызывается под блокировкой)"""
+        total_size = self.__conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        # Ответы перебираются от давно использованных к недавним, пока суммарный размер не станет допустимым
+        keys = []
+        for key, size in self.__conn.execute("SELECT key, size FROM response ORDER BY accessed_at"):
+            if total_size <= self.max_size:
+                break
+            keys.append((key,))
+            total_size -= size
+
+        self.__conn.executemany("DELETE FROM response WHERE key = ?", keys)
@@ -0,0 +1,297 @@
+import json
+import random
+import sys
+import time
+from abc import abstractmethod
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.base_job_api import JobAPI
+from src.http_cache import ResponseCache
+from src.metrics import METRICS
+from src.rate_limiter import TokenBucket
+
+
+class APIResponseError(ValueError):
+    """Исключение для неудачного ответа API (код ответа - в атрибуте 'status_code')"""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CacheMissError(ValueError):
+    """Исключение для запроса, ответа на который нет в кеше при работе без обращения к API (offline)"""
+
+
+def get_retry_delay(retry_after: str | None, attempt: int, backoff_factor: float, max_backoff: float) -> float:
+    """Функция расчета задержки (в секундах) перед повторной попыткой запроса номер 'attempt' (с нуля).
+    Общая для синхронного и асинхронного клиентов API. Если сервер прислал заголовок 'Retry-After'
+    (количество секунд или дата HTTP), используется он, иначе - экспоненциальная задержка со случайным разбросом.
+    Задержка не превышает 'max_backoff' секунд."""
+    if retry_after:
+        try:
+            delay = float(retry_after)  # Значение в секундах
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()  # Значение в виде даты
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), max_backoff)
+
+    return random.uniform(0, min(backoff_factor * 2 ** attempt, max_backoff))
+
+
+class HTTPJobAPI(JobAPI):
+    """Базовый класс для поиска вакансий через HTTP API платформ (hh.ru, superjob.ru).
+    Содержит общую для всех платформ логику: HTTP-сессию с пулом соединений, повторные попытки запросов,
+    ограничение частоты запросов, кеш ответов и параллельную постраничную загрузку вакансий.
+    Подклассы задают адрес поиска (VACANCIES_URL), получение страницы выдачи (_get_page) и формат вакансий."""
+    VACANCIES_URL: str  # URL для поиска вакансий
+    MAX_DEPTH: int  # Максимальное количество вакансий, которое платформа отдает по одному поисковому запросу
+    RETRY_STATUSES = (429, 500, 502, 503, 504)  # Коды ответов, при которых запрос повторяется
+
+    params: dict  # Параметры для GET-запроса по API
+
+    def __init__(self, max_workers: int = 8, pool_size: int | None = None, max_retries: int = 3,
+                 backoff_factor: float = 0.5, rate_limit: float = 10.0, timeout: float = 10.0,
+                 cache: ResponseCache | None = None, offline: bool = False, max_backoff: float = 60.0) -> None:
+        """Метод-конструктор для инициализации экземпляров класса HTTPJobAPI.
+        Определение значений атрибутов экземпляров.
+        max_workers - максимальное количество одновременных запросов к API (1 - последовательная загрузка страниц),
+        pool_size - размер пула HTTP-соединений (по умолчанию равен max_workers),
+        max_retries - количество повторных попыток при ошибках 429/5xx и сбоях соединения,
+        backoff_factor - базовая задержка (в секундах) между повторными попытками,
+        rate_limit - максимальное количество запросов к API в секунду,
+        timeout - время ожидания ответа от сервера (в секундах),
+        cache - кеш ответов API (None - без кеширования),
+        offline - режим работы без обращения к API (ответы берутся только из кеша),
+        max_backoff - максимальная задержка перед повторной попыткой, в т.ч. по заголовку 'Retry-After' (секунды)."""
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("Количество одновременных запросов должно быть целым положительным числом.")
+        if offline and cache is None:
+            raise ValueError("Для работы без обращения к API необходим кеш ответов.")
+
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.truncated_company_ids = set()  # id компаний, вакансии которых при последней загрузке получены не все
+
+        # Одна сессия на весь срок жизни объекта: TCP/TLS-соединения переиспользуются между запросами
+        pool_size = pool_size if pool_size else max_workers
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session = requests.Session()
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+        self.__session.headers.update(self._get_headers())
+
+        self.__rate_limiter = TokenBucket(rate_limit)  # Ограничение частоты запросов на стороне клиента
+
+    def __enter__(self) -> "HTTPJobAPI":
+        """Метод входа в контекстный менеджер"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Метод выхода из контекстного менеджера (закрытие сессии)"""
+        self.close()
+
+    def close(self) -> None:
+        """Метод закрытия HTTP-сессии и всех соединений из пула"""
+        self.__session.close()
+
+    def _get_headers(self) -> dict:
+        """Метод получения дополнительных заголовков для всех запросов к API (защищенный)"""
+        return {}
+
+    def _get_retry_delay(self, response: requests.Response | None, attempt: int) -> float:
+        """Метод расчета задержки перед повторной попыткой запроса (защищенный), см. функцию 'get_retry_delay'"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        return get_retry_delay(retry_after, attempt, self.backoff_factor, self.max_backoff)
+
+    def _connect(self, params, url: str | None = None):
+        """Метод подключения к API (защищенный). По умолчанию запрос выполняется по адресу VACANCIES_URL.
+        Возвращает ответ API в формате JSON. При наличии кеша актуальный ответ берется из него,
+        а устаревший перепроверяется условным запросом (при ответе 304 сохраненные данные используются повторно)."""
+        # Валидация данных перед выполнением GET-запроса
+        if not isinstance(params, dict):
+            raise ValueError("Неверный тип данных у атрибута 'params'.")
+
+        url = url if url else self.VACANCIES_URL
+
+        # Ключ кеша - полный адрес запроса вместе с параметрами
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        entry = self.cache.get(cache_key) if self.cache else None
+
+        if entry and (self.offline or self.cache.is_fresh(entry)):
+            METRICS.inc("http_cache_hits_total", source=self.source, result="fresh")
+            return json.loads(entry.body)  # Ответ из кеша без обращения к API
+        if self.offline:
+            raise CacheMissError(f"Ответ на запрос '{cache_key}' отсутствует в кеше (работа без обращения к API).")
+
+        # Условный запрос: сервер вернет 304 без тела ответа, если данные не изменились
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        for attempt in range(self.max_retries + 1):
+            self.__rate_limiter.acquire()  # Ожидание разрешения от ограничителя частоты запросов
+
+            try:
+                with METRICS.timer("http_request_duration_seconds", source=self.source):
+                    # API-запрос на получение информации по вакансиям
+                    response = self.__session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                METRICS.inc("http_requests_total", source=self.source, status="error")
+                if attempt == self.max_retries:
+                    raise
+                METRICS.inc("http_retries_total", source=self.source)
+                time.sleep(self._get_retry_delay(None, attempt))
+                continue  # Повтор запроса после сбоя соединения
+
+            METRICS.inc("http_requests_total", source=self.source, status=response.status_code)
+            METRICS.inc("http_response_bytes_total", len(response.content), source=self.source)
+
+            if response.status_code == 304 and entry:
+                METRICS.inc("http_cache_hits_total", source=self.source, result="not_modified")
+                self.cache.touch(cache_key)
+                return json.loads(entry.body)  # Данные не изменились, используется сохраненный ответ
+
+            if response.status_code == 200:
+                if self.cache:
+                    self.cache.set(cache_key, response.content,
+                                   response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return response.json()  # Возврат ответа от API, если запрос удачный
+
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.max_retries:
+                break  # Ошибка не временная или попытки закончились
+
+            METRICS.inc("http_retries_total", source=self.source)
+            time.sleep(self._get_retry_delay(response, attempt))
+
+        raise APIResponseError(
+            f"Неудачная попытка API-запроса по адресу '{url}'. Возможная причина: "
+            f"{response.reason}.", response.status_code)
+
+    @abstractmethod
+    def _get_page(self, company_id: str, page_number: int, per_page: int, filters: dict | None = None) -> dict:
+        """Метод получения одной страницы с вакансиями компании (защищенный).
+        filters - дополнительные параметры поискового запроса.
+        Возвращает ответ API в формате hh.ru (вакансии в ключе "items", количество страниц в ключе "pages",
+        количество найденных вакансий в ключе "found")."""
+        pass
+
+    def _split_query(self, company_id: str, per_page: int, filters: dict, found: int) -> list[dict] | None:
+        """Метод разбиения поискового запроса, по которому найдено больше MAX_DEPTH вакансий, на части (защищенный).
+        Возвращает параметры запроса для каждой части или None, если запрос разбить нельзя
+        (по умолчанию запрос не разбивается, вакансии сверх MAX_DEPTH не загружаются)."""
+        return None
+
+    def _get_first_page(self, company_id: str, per_page: int, filters: dict) -> tuple[dict, list[dict] | None]:
+        """Метод получения первой страницы поискового запроса (защищенный).
+        Возвращает ответ API и параметры частей запроса, если найдено больше MAX_DEPTH вакансий
+        и запрос удалось разбить (иначе None)."""
+        result = self._get_page(company_id, 0, per_page, filters)
+        found = result.get("found", 0)
+        parts = self._split_query(company_id, per_page, filters, found) if found > self.MAX_DEPTH else None
+        return result, parts
+
+    def _iter_pages(self, company_ids: list[str], per_page: int) -> Iterator[tuple[tuple, list[dict]]]:
+        """Генератор страниц с вакансиями компаний (защищенный).
+        Возвращает пары (ключ страницы, вакансии) по мере получения ответов от API. По ключу (номер компании в списке,
+        номер части выдачи, номер страницы) страницы можно упорядочить.
+        Платформа отдает не больше MAX_DEPTH вакансий по одному запросу, поэтому выдача большой компании
+        разбивается на части методом '_split_query'. id компаний, вакансии которых не удалось получить
+        полностью, сохраняются в атрибуте 'truncated_company_ids'."""
+        if not isinstance(company_ids, list):
+            raise TypeError("Неверный тип данных у параметров запроса вакансий.")
+
+        self.truncated_company_ids = set()
+        max_pages = max(self.MAX_DEPTH // per_page, 1)
+        seen = {}  # {номер компании: id полученных вакансий} для компаний, выдача которых разбита на части
+
+        # Очередь задач на загрузку страниц: (метод, аргументы, (номер компании, номер части выдачи, параметры части,
+        # страница)). Сначала загружаются первые страницы по всем компаниям
+        tasks = deque((self._get_first_page, (company_id, per_page, {}), (index, (), {}, 0))
+                      for index, company_id in enumerate(company_ids))
+        pending = {}  # {задача: (номер компании, номер части выдачи, параметры части, страница)}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while True:
+                    # Одновременно выполняется не больше 'max_workers' задач: следующие задачи ставятся в работу
+                    # только после того, как полученные страницы переданы вызывающему коду
+                    while tasks and len(pending) < self.max_workers:
+                        func, args, task_key = tasks.popleft()
+                        pending[executor.submit(func, *args)] = task_key
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, part, filters, page_number = pending.pop(future)
+                        company_id = company_ids[index]
+
+                        if page_number > 0:
+                            result = future.result()
+                        else:
+                            result, parts = future.result()
+                            if parts:
+                                # Вместо выдачи целиком загружаются ее части (вакансия может быть в нескольких)
+                                seen.setdefault(index, set())
+                                tasks.extend((self._get_first_page, (company_id, per_page, part_filters),
+                                              (index, part + (part_number,), part_filters, 0))
+                                             for part_number, part_filters in enumerate(parts))
+                                continue
+
+                            if result.get("found", 0) > self.MAX_DEPTH:
+                                self.truncated_company_ids.add(company_id)
+                                print(f"Получены не все вакансии компании {company_id} (источник {self.source}, "
+                                      f"параметры запроса: {filters if filters else 'нет'}): API отдает не больше "
+                                      f"{self.MAX_DEPTH} из {result['found']} найденных, а разбить запрос на части "
+                                      "не удалось.",
+                                      file=sys.stderr)
+
+                            # После получения первой страницы - задачи на загрузку остальных страниц
+                            tasks.extend((self._get_page, (company_id, next_page, per_page, filters),
+                                          (index, part, filters, next_page))
+                                         for next_page in range(1, min(result.get("pages", 1), max_pages)))
+
+                        items = result.get("items", [])
+                        if index in seen:  # Вакансии, уже полученные в другой части выдачи, пропускаются
+                            items = [item for item in items if item["id"] not in seen[index]]
+                            seen[index].update(item["id"] for item in items)
+                        yield (index, part, page_number), items
+            finally:
+                # Отмена еще не начатых задач при ошибке или досрочном прекращении перебора
+                for future in pending:
+                    future.cancel()
+
+    def iter_vacancy_pages(self, company_ids: list[str], page=100) -> Iterator[list[dict]]:
+        """Генератор вакансий по id организаций (на платформе поиска вакансий).
+        Возвращает вакансии постранично (списками словарей) по мере получения ответов от API,
+        поэтому обработка данных может начинаться до окончания загрузки всех страниц."""
+        for _, items in self._iter_pages(company_ids, page):
+            yield items
+
+    @METRICS.timed("api_operation_duration_seconds")
+    def get_vacancies(self, company_ids: list[str], page=100) -> list[dict] | None:
+        """Метод получения вакансий по id организаций (на платформе поиска вакансий).
+        Принимает список id номеров компаний.
+        Возвращает список словарей с данными о вакансиях (со всех страниц выдачи по каждой компании)."""
+        # Запросы выполняются отдельно по каждой компании, чтобы не упираться в ограничение платформы
+        # на глубину выдачи (не более MAX_DEPTH вакансий на один поисковый запрос).
+        # Страницы загружаются параллельно и собираются в порядке компаний и страниц
+        pages = sorted(self._iter_pages(company_ids, page), key=lambda page_data: page_data[0])
+        return [vacancy for _, items in pages for vacancy in items]
@@ -0,0 +1,192 @@
+import functools
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TextIO
+
+# Границы интервалов гистограмм длительности (в секундах), как в клиентских библиотеках Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Класс гистограммы значений (например, длительности операций) с фиксированными границами интервалов"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Метод-конструктор для инициализации экземпляров класса Histogram. buckets - верхние границы интервалов."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Количество значений в каждом интервале (последний - выше всех границ)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Метод добавления значения в гистограмму"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        """Метод получения накопленного количества значений для каждой границы (включая '+Inf')"""
+        result, total = [], 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class MetricsRegistry:
+    """Класс для сбора метрик производительности (счетчики, текущие значения и гистограммы с метками)
+    и их выгрузки в текстовом формате Prometheus. Методы класса можно вызывать из разных потоков."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, slow_query_threshold: float | None = None,
+                 slow_query_stream: TextIO | None = None) -> None:
+        """Метод-конструктор для инициализации экземпляров класса MetricsRegistry.
+        buckets - границы интервалов гистограмм (в секундах),
+        slow_query_threshold - длительность SQL-запроса (в секундах), начиная с которой запрос записывается
+        в журнал медленных запросов (None - журнал не ведется),
+        slow_query_stream - поток для журнала медленных запросов (по умолчанию sys.stderr)."""
+        self.buckets = buckets
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_stream = slow_query_stream
+        self.__lock = threading.Lock()
+        self.__counters = {}  # {(название метрики, метки): значение}
+        self.__gauges = {}
+        self.__histograms = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        """Получение ключа метрики из названия и меток (защищенный метод)"""
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Метод увеличения счетчика 'name' с метками 'labels' на 'value'"""
+        key = self._key(name, labels)
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Метод установки текущего значения 'name' с метками 'labels' (например, скорости последней загрузки)"""
+        with self.__lock:
+            self.__gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Метод добавления значения в гистограмму 'name' с метками 'labels'"""
+        key = self._key(name, labels)
+        with self.__lock:
+            if key not in self.__histograms:
+                self.__histograms[key] = Histogram(self.buckets)
+            self.__histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Контекстный менеджер для измерения длительности блока кода (в секундах) в гистограмме 'name'"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str):
+        """Декоратор для измерения длительности вызовов функции в гистограмме 'name'
+        (метка 'operation' - имя функции)"""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, operation=func.__name__):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def log_slow_query(self, query: str, duration: float) -> None:
+        """Метод записи SQL-запроса в журнал медленных запросов, если его длительность не меньше порогового значения"""
+        if self.slow_query_threshold is None or duration < self.slow_query_threshold:
+            return
+
+        self.inc("db_slow_queries_total")
+        print(f"Медленный запрос ({duration * 1000:.1f} мс): {' '.join(query.split())}",
+              file=self.slow_query_stream if self.slow_query_stream else sys.stderr, flush=True)
+
+    def get(self, name: str, **labels) -> float:
+        """Метод получения значения счетчика или текущего значения 'name' с метками 'labels' (0, если значения нет)"""
+        key = self._key(name, labels)
+        with self.__lock:
+            return self.__counters.get(key, self.__gauges.get(key, 0))
+
+    def reset(self) -> None:
+        """Метод удаления всех собранных метрик"""
+        with self.__lock:
+            self.__counters.clear()
+            self.__gauges.clear()
+            self.__histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+        """Преобразование меток в строку формата Prometheus, например {source="hh"} (защищенный метод)"""
+        labels = labels + extra
+        if not labels:
+            return ""
+        # Обратная косая черта, кавычки и переводы строк в значениях меток экранируются
+        values = (label + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                  for label, value in labels)
+        return "{" + ",".join(values) + "}"
+
+    def render(self) -> str:
+        """Метод выгрузки всех метрик в текстовом формате Prometheus"""
+        lines = []
+        with self.__lock:
+            for metric_type, metrics in (("counter", self.__counters), ("gauge", self.__gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for (metric_name, labels), value in sorted(metrics.items()):
+                        if metric_name == name:
+                            lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self.__histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric_name, labels), histogram in sorted(self.__histograms.items(), key=lambda item: item[0]):
+                    if metric_name != name:
+                        continue
+                    bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.cumulative_counts()):
+                        lines.append(f"{name}_bucket{self._format_labels(labels, (('le', bound),))} {count}")
+                    lines.append(f"{name}_sum{self._format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{self._format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Метод сохранения всех метрик в файл в текстовом формате Prometheus (например, для node_exporter)"""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+
+
+# Общий реестр метрик для всех классов приложения
+METRICS = MetricsRegistry()
+
+
+def serve_metrics(port: int, registry: MetricsRegistry = METRICS, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Функция запуска HTTP-сервера с метриками в формате Prometheus (адрес http://host:port/metrics) в фоновом потоке.
+    Возвращает сервер; для остановки вызывается его метод shutdown()."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Обработчик запросов к серверу метрик"""
+
+        def do_GET(self) -> None:
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass  # Запросы к серверу метрик не выводятся в консоль
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
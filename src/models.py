@@ -0,0 +1,83 @@
+import re
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class VacancyRecord(NamedTuple):
+    """Вакансия в едином формате для всех источников (порядок полей соответствует столбцам таблицы 'vacancy')"""
+    source: str  # Источник вакансии ('hh', 'superjob' и т.п.)
+    vacancy_id: int  # id вакансии в источнике
+    company_id: int  # id компании в источнике
+    company_name: str
+    title: str
+    salary_from: int | None
+    salary_to: int | None
+    currency: str | None
+    vacancy_url: str
+    description: str | None
+
+    def fingerprint(self) -> tuple:
+        """Метод получения "отпечатка" вакансии для поиска дубликатов в разных источниках:
+        название вакансии и компании без учета регистра и знаков препинания, зарплата и валюта"""
+        has_salary = bool(self.salary_from or self.salary_to)  # Валюта учитывается, только если указана зарплата
+        return (" ".join(re.findall(r"\w+", self.title.casefold())),
+                " ".join(re.findall(r"\w+", self.company_name.casefold())),
+                self.salary_from or None,
+                self.salary_to or None,
+                (self.currency or "").upper().replace("RUB", "RUR") if has_salary else "")
+
+
+class Vacancy(NamedTuple):
+    """Вакансия из БД (поля в порядке столбцов результата SQL-запроса)"""
+    id: int
+    source: str
+    company_name: str
+    title: str
+    salary_from: int | None
+    salary_to: int | None
+    currency: str | None
+    vacancy_url: str
+
+
+class Company(NamedTuple):
+    """Компания из БД с количеством ее актуальных вакансий"""
+    source: str
+    hh_company_id: int
+    company_name: str
+    vacancies_amount: int
+
+
+class SalaryStats(NamedTuple):
+    """Статистика зарплат (в рублях) по вакансиям компании"""
+    company_name: str
+    vacancies_amount: int
+    avg_salary: Decimal
+    median_salary: float
+    p25_salary: float
+    p75_salary: float
+    p90_salary: float
+
+
+class SalaryTrend(NamedTuple):
+    """Средняя и медианная зарплата (в рублях) по вакансиям, опубликованным или изменившимся за период"""
+    period: datetime
+    vacancies_amount: int
+    avg_salary: Decimal
+    median_salary: float
+
+
+class CompanyOpenings(NamedTuple):
+    """Количество открытых и закрытых вакансий компании за период"""
+    period: datetime
+    company_name: str
+    opened: int
+    closed: int
+
+
+class TimeToClose(NamedTuple):
+    """Время закрытия вакансий компании (в днях от первой загрузки вакансии до ее закрытия)"""
+    company_name: str
+    closed_amount: int
+    avg_days: Decimal
+    median_days: float
@@ -0,0 +1,78 @@
+import queue
+import threading
+from collections.abc import Iterator
+
+from src.db_manager import DBManager
+from src.hh_api import HeadHunterAPI
+
+_END = object()  # Признак окончания загрузки страниц
+
+
+def _put(pages_queue: queue.Queue, item, stop: threading.Event) -> bool:
+    """Функция помещения элемента в очередь с ожиданием свободного места (обратное давление на загрузку).
+    Возвращает False, если ожидание прервано из-за остановки записи в БД."""
+    while not stop.is_set():
+        try:
+            pages_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(hh_api: HeadHunterAPI, company_ids: list[str], pages_queue: queue.Queue,
+             stop: threading.Event) -> None:
+    """Функция загрузки страниц с вакансиями от API hh.ru в очередь (выполняется в отдельном потоке).
+    Ошибка загрузки передается через очередь в поток записи в БД."""
+    try:
+        for items in hh_api.iter_vacancy_pages(company_ids):
+            if not _put(pages_queue, items, stop):
+                return
+    except Exception as error:
+        _put(pages_queue, error, stop)
+    _put(pages_queue, _END, stop)
+
+
+def _consume(pages_queue: queue.Queue, batch_size: int, counter: list[int]) -> Iterator[list[dict]]:
+    """Генератор порций вакансий из очереди для записи в БД
+    (не менее 'batch_size' вакансий в порции, кроме последней)"""
+    batch = []
+    while (item := pages_queue.get()) is not _END:
+        if isinstance(item, Exception):
+            raise item  # Ошибка при загрузке от API: транзакция записи в БД откатывается
+
+        batch.extend(item)
+        if len(batch) >= batch_size:
+            counter[0] += len(batch)
+            yield batch
+            batch = []
+
+    if batch:
+        counter[0] += len(batch)
+        yield batch
+
+
+def sync_vacancies(hh_api: HeadHunterAPI, data_base: DBManager, company_ids: list[str],
+                   queue_size: int = 20, batch_size: int = 1000) -> int:
+    """Функция синхронизации вакансий: загрузка от API hh.ru и запись в БД выполняются одновременно.
+    Страницы с вакансиями передаются через очередь на 'queue_size' страниц: при заполнении очереди загрузка
+    приостанавливается до записи данных в БД. Полный список вакансий в памяти не собирается.
+    Возвращает количество загруженных вакансий."""
+    pages_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    counter = [0]  # Количество вакансий, переданных на запись в БД
+
+    producer = threading.Thread(target=_produce, args=(hh_api, company_ids, pages_queue, stop), daemon=True)
+    producer.start()
+    try:
+        # Отсутствующие в загрузке вакансии запрошенных компаний помечаются архивными (в том числе у компаний,
+        # у которых не осталось ни одной вакансии), кроме компаний, вакансии которых получены не все.
+        # Генератор перечисляется после загрузки всех страниц, когда такие компании уже известны
+        companies = ((hh_api.source, company_id) for company_id in company_ids
+                     if company_id not in hh_api.truncated_company_ids)
+        data_base.insert_batches_to_db(_consume(pages_queue, batch_size, counter), companies=companies)
+    finally:
+        stop.set()  # Остановка загрузки, если запись в БД завершилась ошибкой
+        producer.join()
+
+    return counter[0]
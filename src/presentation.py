@@ -0,0 +1,28 @@
+from src.models import Company, SalaryStats, Vacancy
+
+# Названия сайтов источников вакансий для вывода в консоль
+SOURCE_SITES = {"hh": "hh.ru", "superjob": "superjob.ru"}
+
+
+def format_company(company: Company) -> str:
+    """Функция преобразования данных о компании в строку для вывода в консоль"""
+    site = SOURCE_SITES.get(company.source, company.source)
+    return (f"id компании на {site}: {company.hh_company_id}. Название компании: {company.company_name}. "
+            f"Количество вакансий на {site}: {company.vacancies_amount}.\n")
+
+
+def format_vacancy(vacancy: Vacancy, url_label: str = "Ссылка на вакансию") -> str:
+    """Функция преобразования данных о вакансии в строку для вывода в консоль"""
+    return (f"Название компании: {vacancy.company_name}.\n"
+            f"Требуется: {vacancy.title}.\n"
+            f"Зарплата от {vacancy.salary_from if vacancy.salary_from else 0} "
+            f"до {vacancy.salary_to if vacancy.salary_to else 0} {vacancy.currency}.\n"
+            f"{url_label}: {vacancy.vacancy_url}.\n")
+
+
+def format_salary_stats(stats: SalaryStats) -> str:
+    """Функция преобразования статистики зарплат компании в строку для вывода в консоль"""
+    return (f"Название компании: {stats.company_name}. Вакансий с указанной зарплатой: {stats.vacancies_amount}. "
+            f"Средняя зарплата: {round(stats.avg_salary)} руб. Медиана: {round(stats.median_salary)} руб. "
+            f"Процентили 25/75/90: {round(stats.p25_salary)} / {round(stats.p75_salary)} / "
+            f"{round(stats.p90_salary)} руб.\n")
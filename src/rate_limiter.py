@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Класс ограничителя частоты запросов по алгоритму 'token bucket' (потокобезопасный)"""
+
+    def __init__(self, rate: float, capacity: int | None = None) -> None:
+        """Метод-конструктор для инициализации экземпляров класса TokenBucket.
+        rate - количество запросов в секунду, capacity - максимальное количество запросов подряд без ожидания."""
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть положительным числом.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity else max(int(rate), 1)
+        self.__tokens = float(self.capacity)  # На начало работы "корзина" заполнена полностью
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def _take_token(self) -> float:
+        """Метод получения токена (защищенный).
+        Возвращает 0, если токен получен, иначе - время ожидания (в секундах) до появления следующего токена."""
+        with self.__lock:
+            now = time.monotonic()
+            # Пополнение "корзины" токенами за время, прошедшее с последнего обращения
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.rate)
+            self.__updated_at = now
+
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return 0
+
+            return (1 - self.__tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Метод получения разрешения на выполнение одного запроса (ожидает, пока в "корзине" не появится токен)"""
+        while wait_time := self._take_token():
+            time.sleep(wait_time)
+
+    async def acquire_async(self) -> None:
+        """Асинхронный вариант метода 'acquire' (ожидание не блокирует цикл событий)"""
+        while wait_time := self._take_token():
+            await asyncio.sleep(wait_time)
@@ -0,0 +1,66 @@
+import math
+import os
+
+from src.base_job_api import register_provider
+from src.http_cache import ResponseCache
+from src.http_client import HTTPJobAPI
+from src.models import VacancyRecord
+
+
+@register_provider
+class SuperJobAPI(HTTPJobAPI):
+    """Класс для поиска вакансий на платформе superjob.ru.
+    Повторные попытки, ограничение частоты запросов, кеш ответов и параллельная загрузка страниц
+    используются те же, что и для hh.ru (общий базовый класс HTTPJobAPI). Курсы валют и подробные данные
+    о вакансиях загружаются только с hh.ru, выдача больше MAX_DEPTH вакансий на части не разбивается."""
+    source = "superjob"  # Название источника вакансий
+    VACANCIES_URL = "https://api.superjob.ru/2.0/vacancies/"  # URL для поиска вакансий
+    MAX_DEPTH = 500  # Максимальное количество вакансий, которое superjob.ru отдает по одному поисковому запросу
+
+    def __init__(self, api_key: str | None = None, max_workers: int = 4, rate_limit: float = 2.0,
+                 cache: ResponseCache | None = None, offline: bool = False, **kwargs) -> None:
+        """Метод-конструктор для инициализации экземпляров класса SuperJobAPI.
+        api_key - секретный ключ приложения superjob.ru (по умолчанию берется из переменной окружения
+        SUPERJOB_API_KEY),
+        остальные параметры аналогичны параметрам класса HTTPJobAPI."""
+        self.api_key = api_key if api_key else os.getenv("SUPERJOB_API_KEY")
+        if not self.api_key and not offline:
+            raise ValueError("Не указан ключ API superjob.ru (переменная окружения SUPERJOB_API_KEY).")
+
+        super().__init__(max_workers=max_workers, rate_limit=rate_limit, cache=cache, offline=offline, **kwargs)
+
+    def _get_headers(self) -> dict:
+        """Метод получения заголовков для всех запросов к API (защищенный): ключ приложения superjob.ru"""
+        return {"X-Api-App-Id": self.api_key} if self.api_key else {}
+
+    @staticmethod
+    def normalize(vacancy: dict) -> VacancyRecord:
+        """Метод преобразования вакансии из ответа API superjob.ru в единый формат VacancyRecord.
+        Коды валют приводятся к кодам hh.ru (например, 'rub' -> 'RUR') для пересчета зарплат по одним курсам."""
+        currency = (vacancy.get("currency") or "").upper()
+        return VacancyRecord("superjob",
+                             int(vacancy["id"]),
+                             int(vacancy["id_client"]),
+                             vacancy["firm_name"],
+                             vacancy["profession"],
+                             vacancy.get("payment_from") or 0,
+                             vacancy.get("payment_to") or 0,
+                             "RUR" if currency == "RUB" else currency,
+                             vacancy["link"],
+                             vacancy.get("candidat"))
+
+    def _get_page(self, company_id: str, page_number: int, per_page: int, filters: dict | None = None) -> dict:
+        """Метод получения одной страницы с вакансиями компании (защищенный).
+        Ответ API superjob.ru приводится к формату hh.ru (вакансии в ключе "items", количество страниц в ключе "pages",
+        количество найденных вакансий в ключе "found"), поэтому постраничная загрузка выполняется методами
+        класса HTTPJobAPI."""
+        params = {
+            "id_client": company_id,
+            "count": per_page,
+            "page": page_number,
+            **(filters if filters else {}),
+        }
+        result = self._connect(params)
+        return {"items": result.get("objects", []),
+                "pages": math.ceil(result.get("total", 0) / per_page),
+                "found": result.get("total", 0)}
@@ -0,0 +1,46 @@
+from src.aggregator import deduplicate_vacancies
+from src.models import VacancyRecord
+
+
+def make_record(source: str, vacancy_id: int, title: str = "Python-разработчик", company_name: str = "ООО Ромашка",
+                salary_from: int | None = 100000, salary_to: int | None = None,
+                currency: str | None = "RUR") -> VacancyRecord:
+    """Создание вакансии в едином формате с типичными значениями полей"""
+    return VacancyRecord(source, vacancy_id, 1, company_name, title, salary_from, salary_to, currency,
+                         f"https://example.com/{vacancy_id}", None)
+
+
+def test_fingerprint_ignores_case_punctuation_and_currency_alias():
+    """Регистр, знаки препинания и код валюты ('RUB' и 'RUR') не влияют на "отпечаток" вакансии"""
+    hh = make_record("hh", 1, title="Python-разработчик", company_name="ООО «Ромашка»", currency="RUR")
+    superjob = make_record("superjob", 2, title="python разработчик", company_name="ооо ромашка", currency="rub")
+
+    assert hh.fingerprint() == superjob.fingerprint()
+
+
+def test_fingerprint_ignores_currency_without_salary():
+    """Валюта не учитывается, если зарплата не указана (источники по-разному заполняют это поле)"""
+    hh = make_record("hh", 1, salary_from=0, currency="")
+    superjob = make_record("superjob", 2, salary_from=None, currency="RUR")
+
+    assert hh.fingerprint() == superjob.fingerprint()
+
+
+def test_fingerprint_differs_by_salary():
+    """Вакансии с разной зарплатой - разные вакансии"""
+    assert make_record("hh", 1, salary_from=100000).fingerprint() != \
+        make_record("hh", 2, salary_from=120000).fingerprint()
+
+
+def test_deduplicate_keeps_first_source():
+    """Из дубликатов в разных источниках остается вакансия источника, стоящего в списке раньше"""
+    records = [make_record("hh", 1), make_record("superjob", 2), make_record("superjob", 3, title="Аналитик")]
+
+    assert deduplicate_vacancies(records) == [records[0], records[2]]
+
+
+def test_deduplicate_keeps_same_source_duplicates():
+    """Одинаковые вакансии одного источника не считаются дубликатами (например, в разных городах)"""
+    records = [make_record("hh", 1), make_record("hh", 2), make_record("superjob", 3)]
+
+    assert deduplicate_vacancies(records) == records[:2]
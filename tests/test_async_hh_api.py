@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from benchmarks.data_generator import SyntheticDataset
+from benchmarks.mock_server import MockHeadHunterServer
+from src import async_hh_api
+from src.async_hh_api import AsyncHeadHunterAPI
+
+
+class FakeResponse:
+    """Ответ aiohttp с заданным кодом и заголовками"""
+
+    def __init__(self, status: int, headers: dict | None = None) -> None:
+        self.status = status
+        self.reason = "Reason"
+        self.headers = headers or {}
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def json(self) -> dict:
+        return {"items": []}
+
+
+class FakeSession:
+    """HTTP-сессия, возвращающая ответы по очереди"""
+
+    def __init__(self, responses: list[FakeResponse]) -> None:
+        self.responses = responses
+        self.calls = 0
+
+    def get(self, url, params=None) -> FakeResponse:
+        self.calls += 1
+        return self.responses[self.calls - 1]
+
+
+def test_connect_async_uses_shared_retry_delay(monkeypatch):
+    """'Retry-After' в виде даты HTTP учитывается так же, как в синхронном клиенте"""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(async_hh_api.asyncio, "sleep", sleep)
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    session = FakeSession([FakeResponse(503, {"Retry-After": retry_at}), FakeResponse(200)])
+    api = AsyncHeadHunterAPI(max_retries=2, max_backoff=60, rate_limit=1000)
+
+    result = asyncio.run(api._connect_async(session, asyncio.Semaphore(1), {"employer_id": "1"}))
+
+    assert result == {"items": []}
+    assert session.calls == 2
+    assert len(delays) == 1 and 25 <= delays[0] <= 30
+
+
+def test_iter_vacancies_limits_tasks_in_flight():
+    """Задачи на загрузку страниц создаются по мере выдачи результатов, одновременно не больше 'max_concurrency'"""
+    dataset = SyntheticDataset(200, per_company=20)
+
+    async def collect(api: AsyncHeadHunterAPI, server: MockHeadHunterServer) -> list[dict]:
+        pages = api.iter_vacancies(dataset.company_ids(), page=5)
+        vacancies = await anext(pages)
+        await asyncio.sleep(0.1)  # Без ограничения за это время были бы загружены страницы других компаний
+        assert server.requests_amount <= 2
+        async for page in pages:
+            vacancies.extend(page)
+        return vacancies
+
+    with MockHeadHunterServer(dataset, latency=0.01) as server:
+        api = AsyncHeadHunterAPI(max_concurrency=2, rate_limit=1000)
+        api.VACANCIES_URL = f"{server.url}/vacancies"
+        vacancies = asyncio.run(collect(api, server))
+
+    assert sorted(vacancy["id"] for vacancy in vacancies) == [str(50_000_000 + index) for index in range(200)]
+    assert server.requests_amount == 40
@@ -0,0 +1,91 @@
+import pytest
+
+from src import db_manager
+from src.db_manager import DBManager
+
+
+class FakePool:
+    """Пул соединений без подключения к PostgreSQL (для проверки методов, не выполняющих запросов)"""
+    closed = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def closeall(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def offline_db(monkeypatch):
+    """DBManager для существующей БД текущей версии без подключения к серверу"""
+    monkeypatch.setattr(db_manager, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(DBManager, "_create_database", lambda self: False)
+    monkeypatch.setattr(DBManager, "_check_schema_version", lambda self: None)
+    monkeypatch.setattr(DBManager, "_has_trigram_index", lambda self: False)
+    with DBManager("test", {}, incremental=True, cache_size=2, cache_max_rows=3) as db:
+        yield db
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("python", "python:*"),
+    ("Python разработчик", "Python:* & разработчик:*"),
+    ("C++ & (SQL)", "C:* & SQL:*"),
+    ("  ", ""),
+])
+def test_to_tsquery(keyword, expected):
+    """Слова запроса объединяются через '&' и ищутся как префиксы, операторы tsquery из запроса не попадают"""
+    assert DBManager._to_tsquery(keyword) == expected
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("python", "%python%"),
+    ("100%", "%100\\%%"),
+    ("a_b", "%a\\_b%"),
+    ("c\\d", "%c\\\\d%"),
+])
+def test_like_pattern_escapes_wildcards(keyword, expected):
+    """Символы '%', '_' и '\\' в подстроке для ILIKE экранируются"""
+    assert DBManager._like_pattern(keyword) == expected
+
+
+def test_cached_reuses_result_until_data_changes(offline_db):
+    """Повторный запрос берется из кеша; после изменения данных (новая версия) запрос выполняется снова"""
+    calls = []
+
+    def load():
+        calls.append(1)
+        return (len(calls),)
+
+    assert offline_db._cached(("query",), load) == (1,)
+    assert offline_db._cached(("query",), load) == (1,)
+    offline_db._invalidate_cache()
+    assert offline_db._cached(("query",), load) == (2,)
+
+    info = offline_db.cache_info()
+    assert (info["hits"], info["misses"], info["size"], info["data_version"]) == (1, 2, 1, 1)
+
+
+def test_cached_skips_result_loaded_during_data_change(offline_db):
+    """Результат, при получении которого данные изменились, в кеш не сохраняется"""
+
+    def load():
+        offline_db._invalidate_cache()  # Загрузка данных в другом потоке во время выполнения запроса
+        return ("stale",)
+
+    offline_db._cached(("query",), load)
+
+    assert offline_db.cache_info()["size"] == 0
+
+
+def test_cached_evicts_least_recently_used_and_large_results(offline_db):
+    """При переполнении удаляется результат, к которому дольше всего не обращались;
+    результаты больше 'cache_max_rows' строк не сохраняются"""
+    offline_db._cached(("a",), lambda: ("a",))
+    offline_db._cached(("b",), lambda: ("b",))
+    offline_db._cached(("a",), lambda: ("a",))  # Обращение к "a" - первым удаляется "b"
+    offline_db._cached(("c",), lambda: ("c",))
+    offline_db._cached(("large",), lambda: tuple(range(4)))
+
+    assert offline_db._cached(("a",), lambda: ("new",)) == ("a",)
+    assert offline_db._cached(("b",), lambda: ("new",)) == ("new",)
+    assert offline_db._cached(("large",), lambda: ("new",)) == ("new",)
@@ -0,0 +1,59 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.exporters import export_rows
+from src.models import Company, SalaryStats
+
+COMPANIES = [Company("hh", 1740, "Яндекс", 10), Company("superjob", 77, 'ООО "Кавычки", запятые', 2)]
+
+
+def test_export_jsonl():
+    """Каждая строка - отдельный JSON-объект с названиями полей, нестандартные типы выгружаются строкой"""
+    stream = io.StringIO()
+    export_rows(COMPANIES + [SalaryStats("Яндекс", 5, Decimal("100.50"), 90.0, 80.0, 110.0, 120.0)], "jsonl", stream)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0] == {"source": "hh", "hh_company_id": 1740, "company_name": "Яндекс", "vacancies_amount": 10}
+    assert lines[2]["avg_salary"] == "100.50"
+
+
+def test_export_csv():
+    """Заголовок CSV - названия полей, значения с кавычками и запятыми экранируются"""
+    stream = io.StringIO()
+    export_rows(iter(COMPANIES), "csv", stream)
+
+    assert stream.getvalue().splitlines() == [
+        "source,hh_company_id,company_name,vacancies_amount",
+        "hh,1740,Яндекс,10",
+        'superjob,77,"ООО ""Кавычки"", запятые",2',
+    ]
+
+
+def test_export_csv_without_rows():
+    """Пустой результат выгружается пустым файлом (без заголовка)"""
+    stream = io.StringIO()
+    export_rows([], "csv", stream)
+
+    assert stream.getvalue() == ""
+
+
+def test_export_parquet(tmp_path):
+    """Строки выгружаются в Parquet группами по batch_size"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "companies.parquet"
+    with open(path, "w") as stream:
+        export_rows(COMPANIES, "parquet", stream, batch_size=1)
+
+    table = pq.read_table(path)
+    assert table.column_names == list(Company._fields)
+    assert table.num_rows == 2
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+
+def test_export_unknown_format():
+    """Неизвестный формат выгрузки - ValueError"""
+    with pytest.raises(ValueError):
+        export_rows(COMPANIES, "xml", io.StringIO())
@@ -0,0 +1,141 @@
+import math
+import time
+
+from benchmarks.data_generator import SyntheticDataset
+from benchmarks.mock_server import MockHeadHunterServer
+from src.hh_api import HeadHunterAPI
+from src.http_cache import ResponseCache
+
+
+def test_iter_vacancy_details_collects_unavailable_vacancies():
+    """Вакансии, которых нет на сервере (ответ 404), пропускаются, а их id добавляются в список 'unavailable'"""
+    dataset = SyntheticDataset(10)
+    with MockHeadHunterServer(dataset) as server, HeadHunterAPI(rate_limit=1000) as api:
+        api.VACANCIES_URL = f"{server.url}/vacancies"
+        unavailable = []
+
+        details = list(api.iter_vacancy_details([50_000_000, 50_000_001, 99_999_999], unavailable))
+
+    assert sorted(details_item["id"] for details_item in details) == ["50000000", "50000001"]
+    assert unavailable == [99_999_999]
+
+
+def test_iter_vacancy_details_collects_missing_offline(tmp_path, capsys):
+    """При работе без обращения к API вакансии, ответов о которых нет в кеше, добавляются в список 'missing'
+    без сообщения о каждой из них"""
+    dataset = SyntheticDataset(10)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    with MockHeadHunterServer(dataset) as server:
+        with HeadHunterAPI(rate_limit=1000, cache=cache) as api:
+            api.VACANCIES_URL = f"{server.url}/vacancies"
+            list(api.iter_vacancy_details([50_000_000]))  # Ответ сохраняется в кеше
+        with HeadHunterAPI(rate_limit=1000, cache=cache, offline=True) as api:
+            api.VACANCIES_URL = f"{server.url}/vacancies"
+            missing = []
+            details = list(api.iter_vacancy_details([50_000_000, 50_000_001, 50_000_002], missing=missing))
+
+    assert [details_item["id"] for details_item in details] == ["50000000"]
+    assert sorted(missing) == [50_000_001, 50_000_002]
+    assert capsys.readouterr().err == ""
+
+
+def test_iter_vacancy_pages_limits_requests_in_flight():
+    """Следующие страницы запрашиваются только после передачи полученных страниц вызывающему коду,
+    одновременно выполняется не больше 'max_workers' запросов"""
+    dataset = SyntheticDataset(200, per_company=20)
+    with MockHeadHunterServer(dataset, latency=0.01) as server, HeadHunterAPI(max_workers=2, rate_limit=1000) as api:
+        api.VACANCIES_URL = f"{server.url}/vacancies"
+        pages = api.iter_vacancy_pages(dataset.company_ids(), page=5)
+
+        first_page = next(pages)
+        time.sleep(0.1)  # Без ограничения за это время были бы загружены страницы других компаний
+        assert len(first_page) == 5
+        assert server.requests_amount <= 2
+
+        vacancies = [vacancy for page in pages for vacancy in page] + first_page
+
+    assert sorted(vacancy["id"] for vacancy in vacancies) == [str(50_000_000 + index) for index in range(200)]
+    assert server.requests_amount == 40
+
+
+class StubHeadHunterAPI(HeadHunterAPI):
+    """HeadHunterAPI с ответами из памяти вместо запросов к API hh.ru (поиск по компании, регионам и ролям,
+    кластеры выдачи). Ограничение на глубину выдачи уменьшено, чтобы разбиение проверялось на малых данных."""
+    MAX_DEPTH = 20
+
+    def __init__(self, vacancies: dict[str, list[dict]]) -> None:
+        super().__init__(max_workers=4, rate_limit=1000)
+        self.vacancies = vacancies  # {id компании: [{"id": ..., "area": ..., "roles": [...]}, ...]}
+        self.requests = []
+
+    @staticmethod
+    def _matches(vacancy: dict, params: dict) -> bool:
+        """Соответствие вакансии фильтрам запроса по региону и профессиональной роли"""
+        if "area" in params and params["area"] != vacancy["area"]:
+            return False
+        return "professional_role" not in params or params["professional_role"] in vacancy["roles"]
+
+    def _connect(self, params, url=None):
+        self.requests.append(dict(params))
+        found = [vacancy for vacancy in self.vacancies[params["employer_id"]] if self._matches(vacancy, params)]
+
+        per_page, page = params["per_page"], params["page"]
+        result = {"found": len(found), "pages": math.ceil(len(found) / per_page),
+                  "items": found[:self.MAX_DEPTH][page * per_page:(page + 1) * per_page]}
+        if params.get("clusters") == "true":
+            result["clusters"] = []
+            for cluster_id, values in (("area", lambda vacancy: [vacancy["area"]]),
+                                       ("professional_role", lambda vacancy: vacancy["roles"])):
+                counts = {}
+                for vacancy in found:
+                    for value in values(vacancy):
+                        counts[value] = counts.get(value, 0) + 1
+                result["clusters"].append({"id": cluster_id, "items": [
+                    {"count": count, "url": f"https://api.hh.ru/vacancies?{cluster_id}={value}"}
+                    for value, count in counts.items()]})
+        return result
+
+
+def stub_vacancies(company_id: str, amount: int, area, roles) -> list[dict]:
+    """Вакансии компании для StubHeadHunterAPI: area и roles - функции номера вакансии"""
+    return [{"id": f"{company_id}-{index}", "area": area(index), "roles": roles(index)} for index in range(amount)]
+
+
+def test_get_vacancies_splits_query_and_skips_vacancies_from_overlapping_parts():
+    """Выдача больше MAX_DEPTH разбивается по ролям (регион у всех вакансий один); вакансия с несколькими ролями
+    попадает в несколько частей, но возвращается один раз"""
+    api = StubHeadHunterAPI({"1": stub_vacancies("1", 30, lambda index: "1",
+                                                 lambda index: ["10", "20"] if 10 <= index < 15
+                                                 else ["10"] if index < 15 else ["20"])})
+
+    ids = [vacancy["id"] for vacancy in api.get_vacancies(["1"], page=5)]
+
+    assert len(ids) == len(set(ids)) == 30
+    assert api.truncated_company_ids == set()
+    assert {request.get("professional_role") for request in api.requests} >= {"10", "20"}
+
+
+def test_get_vacancies_splits_large_part_recursively():
+    """Часть выдачи (регион), в которой тоже больше MAX_DEPTH вакансий, разбивается дальше по ролям"""
+    api = StubHeadHunterAPI({"1": stub_vacancies("1", 50, lambda index: "1" if index < 40 else "2",
+                                                 lambda index: [str(index % 2)])})
+
+    ids = [vacancy["id"] for vacancy in api.get_vacancies(["1"], page=5)]
+
+    assert sorted(ids) == sorted(f"1-{index}" for index in range(50))
+    assert api.truncated_company_ids == set()
+    assert any(request.get("area") == "1" and "professional_role" in request for request in api.requests)
+
+
+def test_get_vacancies_marks_company_truncated_if_query_cannot_be_split(capsys):
+    """Если выдачу нельзя разбить на части, загружаются первые MAX_DEPTH вакансий, а компания помечается
+    как загруженная не полностью (ее вакансии не архивируются), другие компании загружаются полностью"""
+    api = StubHeadHunterAPI({"1": stub_vacancies("1", 30, lambda index: "1", lambda index: ["10"]),
+                             "2": stub_vacancies("2", 7, lambda index: "1", lambda index: ["10"])})
+
+    vacancies = api.get_vacancies(["1", "2"], page=5)
+
+    assert sum(vacancy["id"].startswith("1-") for vacancy in vacancies) == StubHeadHunterAPI.MAX_DEPTH
+    assert sum(vacancy["id"].startswith("2-") for vacancy in vacancies) == 7
+    assert api.truncated_company_ids == {"1"}
+    assert "Получены не все вакансии компании 1" in capsys.readouterr().err
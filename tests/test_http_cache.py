@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.data_generator import CURRENCY_RATES, SyntheticDataset
+from benchmarks.mock_server import MockHeadHunterServer
+from src import http_cache
+from src.hh_api import HeadHunterAPI
+from src.http_cache import ResponseCache
+from src.metrics import METRICS
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемые часы для модуля кеша: время меняется только явно (clock.now)"""
+    fake_clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(http_cache, "time", SimpleNamespace(time=lambda: fake_clock.now))
+    return fake_clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Кеш ответов во временном файле"""
+    response_cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=60, max_size=10)
+    yield response_cache
+    response_cache.close()
+
+
+def test_get_returns_saved_response(cache):
+    """Сохраненный ответ возвращается вместе с заголовками для условного запроса"""
+    cache.set("key", b"body", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    entry = cache.get("key")
+
+    assert entry.body == b"body"
+    assert entry.etag == '"abc"'
+    assert entry.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.get("missing") is None
+
+
+def test_lru_eviction_removes_least_recently_used(cache, clock):
+    """При превышении max_size удаляется ответ, к которому дольше всего не обращались"""
+    cache.set("first", b"1111")
+    clock.now += 1
+    cache.set("second", b"2222")
+    clock.now += 1
+    cache.get("first")  # "first" становится недавно использованным
+    clock.now += 1
+    cache.set("third", b"3333")  # 12 байт > max_size (10): вытесняется "second"
+
+    assert cache.get("second") is None
+    assert cache.get("first").body == b"1111"
+    assert cache.get("third").body == b"3333"
+
+
+def test_ttl_and_touch(cache, clock):
+    """Ответ актуален в течение ttl, подтверждение сервером (touch) продлевает его актуальность"""
+    cache.set("key", b"body")
+    clock.now += 59
+    assert cache.is_fresh(cache.get("key"))
+
+    clock.now += 2
+    assert not cache.is_fresh(cache.get("key"))
+
+    cache.touch("key")
+    assert cache.is_fresh(cache.get("key"))
+
+
+def test_not_modified_response_reuses_cached_body(tmp_path):
+    """Устаревший ответ перепроверяется условным запросом: на 304 возвращаются сохраненные данные"""
+    response_cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=0)
+    with MockHeadHunterServer(SyntheticDataset(10)) as server, \
+            HeadHunterAPI(rate_limit=1000, cache=response_cache) as api:
+        api.DICTIONARIES_URL = f"{server.url}/dictionaries"
+        not_modified_before = METRICS.get("http_cache_hits_total", source="hh", result="not_modified")
+
+        assert api.get_currency_rates() == CURRENCY_RATES  # Ответ 200 сохраняется в кеш вместе с ETag
+        assert api.get_currency_rates() == CURRENCY_RATES  # ttl=0: условный запрос, ответ 304
+
+        assert server.requests_amount == 2
+        assert server.not_modified_amount == 1
+        assert METRICS.get("http_cache_hits_total", source="hh", result="not_modified") == not_modified_before + 1
+    response_cache.close()
+
+
+def test_offline_mode_uses_only_cache(tmp_path):
+    """В режиме без обращения к API ответ берется из кеша, а при его отсутствии вызывается ValueError"""
+    response_cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=0)
+    with MockHeadHunterServer(SyntheticDataset(10)) as server:
+        with HeadHunterAPI(rate_limit=1000, cache=response_cache) as api:
+            api.DICTIONARIES_URL = f"{server.url}/dictionaries"
+            api.get_currency_rates()
+
+        with HeadHunterAPI(cache=response_cache, offline=True) as api:
+            api.DICTIONARIES_URL = f"{server.url}/dictionaries"
+            assert api.get_currency_rates() == CURRENCY_RATES
+            with pytest.raises(ValueError):
+                api._connect({"employer_id": "1"})
+
+        assert server.requests_amount == 1
+    response_cache.close()
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from src import http_client
+from src.hh_api import HeadHunterAPI
+from src.http_client import APIResponseError
+
+
+def make_response(status_code: int, headers: dict | None = None, content: bytes = b"{}") -> requests.Response:
+    """Ответ API с заданным кодом, заголовками и телом"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "Reason"
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Задержки перед повторными попытками (вместо ожидания сохраняются в список)"""
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+def stub_responses(monkeypatch, responses: list) -> list:
+    """Подмена HTTP-запросов: ответы (или исключения) возвращаются по очереди, возвращается список запросов"""
+    calls = []
+
+    def get(session, url, **kwargs):
+        calls.append(url)
+        response = responses[len(calls) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    return calls
+
+
+@pytest.mark.parametrize("retry_after, expected", [("2", 2.0), ("120", 10.0), ("-5", 0.0)])
+def test_retry_delay_uses_retry_after_seconds_capped_by_max_backoff(retry_after, expected):
+    """Задержка берется из заголовка 'Retry-After' (в секундах), но не больше 'max_backoff'"""
+    with HeadHunterAPI(max_backoff=10.0) as api:
+        assert api._get_retry_delay(make_response(429, {"Retry-After": retry_after}), 0) == expected
+
+
+def test_retry_delay_uses_retry_after_http_date():
+    """'Retry-After' в виде даты HTTP преобразуется в количество секунд до этой даты"""
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    with HeadHunterAPI(max_backoff=60.0) as api:
+        assert 25 <= api._get_retry_delay(make_response(503, {"Retry-After": retry_at}), 0) <= 30
+
+
+def test_retry_delay_without_header_is_exponential_and_capped():
+    """Без 'Retry-After' задержка случайная в пределах экспоненциально растущей границы, но не больше 'max_backoff'"""
+    with HeadHunterAPI(backoff_factor=0.5, max_backoff=3.0) as api:
+        for attempt in range(6):
+            delay = api._get_retry_delay(make_response(503, {"Retry-After": "не число"}), attempt)
+            assert 0 <= delay <= min(0.5 * 2 ** attempt, 3.0)
+
+
+def test_connect_retries_temporary_errors(monkeypatch, delays):
+    """Ответы 429/5xx и сбои соединения повторяются с задержкой, удачный ответ возвращается"""
+    calls = stub_responses(monkeypatch, [make_response(429, {"Retry-After": "1"}), requests.ConnectionError(),
+                                         make_response(200, content=b'{"items": []}')])
+    with HeadHunterAPI(rate_limit=1000, max_retries=3, backoff_factor=0.1) as api:
+        assert api._connect({}) == {"items": []}
+
+    assert len(calls) == 3
+    assert delays[0] == 1.0 and 0 <= delays[1] <= 0.2
+
+
+def test_connect_gives_up_after_max_retries(monkeypatch, delays):
+    """После 'max_retries' повторов вызывается APIResponseError с кодом последнего ответа"""
+    calls = stub_responses(monkeypatch, [make_response(503, {"Retry-After": "100"})] * 3)
+    with HeadHunterAPI(rate_limit=1000, max_retries=2, max_backoff=5.0) as api:
+        with pytest.raises(APIResponseError) as error_info:
+            api._connect({})
+
+    assert error_info.value.status_code == 503
+    assert len(calls) == 3
+    assert delays == [5.0, 5.0]
+
+
+def test_connect_does_not_retry_client_errors(monkeypatch, delays):
+    """Ошибка запроса (например, 404) не повторяется"""
+    calls = stub_responses(monkeypatch, [make_response(404)])
+    with HeadHunterAPI(rate_limit=1000) as api:
+        with pytest.raises(APIResponseError) as error_info:
+            api._connect({})
+
+    assert error_info.value.status_code == 404
+    assert len(calls) == 1 and delays == []
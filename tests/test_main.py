@@ -0,0 +1,48 @@
+import pytest
+
+import main
+from main import parse_employer_ids, read_company_ids
+from src.db_manager import SchemaVersionError
+
+
+def test_parse_employer_ids_groups_by_source():
+    """id без префикса относятся к hh.ru, источники перечисляются в порядке регистрации"""
+    employers = parse_employer_ids(["superjob:77", "1740", "hh:3529", "superjob:78"])
+
+    assert employers == {"hh": ["1740", "3529"], "superjob": ["77", "78"]}
+    assert list(employers) == ["hh", "superjob"]
+
+
+@pytest.mark.parametrize("employer_id", ["unknown:1", "file:1"])
+def test_parse_employer_ids_rejects_unknown_source(employer_id):
+    """Неизвестный источник и файл с вакансиями в качестве источника организации не допускаются"""
+    with pytest.raises(ValueError):
+        parse_employer_ids([employer_id])
+
+
+def test_read_company_ids_skips_comments(tmp_path):
+    """Пустые строки и комментарии после '#' в файле с id организаций не учитываются"""
+    path = tmp_path / "employers.txt"
+    path.write_text("1740  # Яндекс\n\n# Комментарий\nsuperjob:77\n", encoding="utf-8")
+
+    assert read_company_ids(str(path)) == ["1740", "superjob:77"]
+
+
+@pytest.mark.parametrize("argv", [["companies"], ["sync", "--employers", "1740"]])
+def test_run_command_reports_outdated_schema(monkeypatch, capsys, argv):
+    """Устаревшая схема БД в подкомандах выводится сообщением в stderr (с подсказкой про --rebuild),
+    а не трассировкой, и программа завершается с ненулевым кодом"""
+
+    def outdated_schema(*args, **kwargs):
+        raise SchemaVersionError("Пересоздайте БД командой 'python main.py sync --rebuild'.")
+
+    monkeypatch.setattr(main, "config", lambda *args: {})
+    monkeypatch.setattr(main, "DBManager", outdated_schema)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.run_command(argv)
+
+    assert exit_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "--rebuild" in captured.err
+    assert captured.out == ""
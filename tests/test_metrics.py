@@ -0,0 +1,66 @@
+import io
+
+from src.metrics import MetricsRegistry
+
+
+def test_render_counters_and_gauges():
+    """Счетчики и текущие значения выгружаются с типом и метками в формате Prometheus"""
+    registry = MetricsRegistry()
+    registry.inc("http_requests_total", source="hh", status=200)
+    registry.inc("http_requests_total", 2, source="hh", status=200)
+    registry.set("db_insert_rows_per_second", 1500.5)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE http_requests_total counter" in lines
+    assert 'http_requests_total{source="hh",status="200"} 3' in lines
+    assert "# TYPE db_insert_rows_per_second gauge" in lines
+    assert "db_insert_rows_per_second 1500.5" in lines
+
+
+def test_render_histogram_buckets_are_cumulative():
+    """Количество значений в интервалах гистограммы накапливается, последний интервал - '+Inf'"""
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        registry.observe("duration_seconds", value, operation="load")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE duration_seconds histogram" in lines
+    assert 'duration_seconds_bucket{operation="load",le="0.1"} 1' in lines
+    assert 'duration_seconds_bucket{operation="load",le="1.0"} 3' in lines
+    assert 'duration_seconds_bucket{operation="load",le="+Inf"} 4' in lines
+    assert 'duration_seconds_sum{operation="load"} 6.25' in lines
+    assert 'duration_seconds_count{operation="load"} 4' in lines
+
+
+def test_render_escapes_label_values():
+    """Кавычки, обратная косая черта и перевод строки в значениях меток экранируются"""
+    registry = MetricsRegistry()
+    registry.inc("errors_total", reason='bad "value"\\\n')
+
+    assert 'errors_total{reason="bad \\"value\\"\\\\\\n"} 1' in registry.render().splitlines()
+
+
+def test_timed_decorator_observes_duration():
+    """Декоратор timed добавляет длительность вызова в гистограмму с меткой 'operation'"""
+    registry = MetricsRegistry()
+
+    @registry.timed("operation_duration_seconds")
+    def load() -> int:
+        return 42
+
+    assert load() == 42
+    assert 'operation_duration_seconds_count{operation="load"} 1' in registry.render().splitlines()
+
+
+def test_slow_query_log():
+    """В журнал попадают только запросы не короче порогового значения"""
+    stream = io.StringIO()
+    registry = MetricsRegistry(slow_query_threshold=0.5, slow_query_stream=stream)
+
+    registry.log_slow_query("SELECT 1", 0.1)
+    registry.log_slow_query("SELECT *\n    FROM vacancy", 0.75)
+
+    assert stream.getvalue() == "Медленный запрос (750.0 мс): SELECT * FROM vacancy\n"
+    assert registry.get("db_slow_queries_total") == 1
@@ -0,0 +1,73 @@
+import itertools
+
+import pytest
+
+from src.pipeline import sync_vacancies
+
+
+class StubAPI:
+    """Источник вакансий, отдающий страницы из генератора 'pages' (вместо загрузки от API hh.ru)"""
+    source = "hh"
+
+    def __init__(self, pages, truncated_company_ids=()) -> None:
+        self.pages = pages
+        self.truncated_company_ids = set(truncated_company_ids)
+        self.produced = 0  # Количество страниц, переданных в конвейер
+
+    def iter_vacancy_pages(self, company_ids):
+        for page in self.pages:
+            self.produced += 1
+            yield page
+
+
+class StubDB:
+    """БД, сохраняющая в памяти порции вакансий и компании, вакансии которых архивируются"""
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.fail_after = fail_after  # Ошибка записи после указанного количества порций
+        self.batches = []
+        self.companies = None
+
+    def insert_batches_to_db(self, batches, companies=None):
+        for batch in batches:
+            if self.fail_after is not None and len(self.batches) == self.fail_after:
+                raise RuntimeError("Ошибка записи в БД")
+            self.batches.append(batch)
+        self.companies = list(companies)
+
+
+def test_sync_vacancies_writes_batches_and_skips_truncated_companies():
+    """Страницы объединяются в порции не меньше 'batch_size' вакансий; архивируются вакансии только тех
+    компаний, которые загружены полностью"""
+    pages = [[{"id": str(index)} for index in range(start, start + 3)] for start in range(0, 12, 3)]
+    data_base = StubDB()
+
+    amount = sync_vacancies(StubAPI(iter(pages), truncated_company_ids={"2"}), data_base, ["1", "2"], batch_size=5)
+
+    assert amount == 12
+    assert [len(batch) for batch in data_base.batches] == [6, 6]
+    assert data_base.companies == [("hh", "1")]
+
+
+def test_sync_vacancies_propagates_api_error():
+    """Ошибка загрузки от API передается в поток записи в БД (транзакция откатывается) и вызывается повторно"""
+
+    def pages():
+        yield [{"id": "1"}]
+        raise ConnectionError("Нет соединения с API")
+
+    data_base = StubDB()
+    with pytest.raises(ConnectionError):
+        sync_vacancies(StubAPI(pages()), data_base, ["1"], batch_size=10)
+
+    assert data_base.companies is None  # Запись не завершилась, вакансии не архивируются
+
+
+def test_sync_vacancies_stops_producer_on_db_error():
+    """При ошибке записи в БД загрузка останавливается: поток загрузки завершается, не заполняя очередь дальше"""
+    api = StubAPI(([{"id": str(index)}] for index in itertools.count()))  # Бесконечная выдача
+
+    with pytest.raises(RuntimeError):
+        sync_vacancies(api, StubDB(fail_after=1), ["1"], queue_size=2, batch_size=1)
+
+    assert api.produced <= 5  # Две порции записаны или прочитаны, еще не больше 'queue_size' + 1 в очереди
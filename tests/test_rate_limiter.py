@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+import pytest
+
+from src.rate_limiter import TokenBucket
+
+
+def test_rate_must_be_positive():
+    """Частота запросов должна быть положительной"""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_burst_up_to_capacity_without_waiting():
+    """Запросы в пределах емкости "корзины" выполняются без ожидания"""
+    bucket = TokenBucket(rate=1, capacity=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+
+    assert time.monotonic() - start < 0.1
+
+
+def test_acquire_waits_for_next_token():
+    """После исчерпания "корзины" запросы выполняются не чаще 'rate' в секунду"""
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+
+    assert time.monotonic() - start >= 4 / 20 * 0.9
+
+
+def test_acquire_async_waits_for_next_token():
+    """Асинхронное получение токена соблюдает то же ограничение частоты"""
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def acquire_all() -> float:
+        await bucket.acquire_async()
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(4)))
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire_all()) >= 4 / 20 * 0.9
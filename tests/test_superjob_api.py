@@ -0,0 +1,14 @@
+from src.hh_api import HeadHunterAPI
+from src.http_client import HTTPJobAPI
+from src.superjob_api import SuperJobAPI
+
+
+def test_superjob_api_shares_http_client_but_not_hh_features():
+    """SuperJobAPI использует общий HTTP-клиент, но не наследует возможности, которые есть только у hh.ru"""
+    assert issubclass(SuperJobAPI, HTTPJobAPI)
+    assert not issubclass(SuperJobAPI, HeadHunterAPI)
+    for name in ("DICTIONARIES_URL", "get_currency_rates", "iter_vacancy_details"):
+        assert not hasattr(SuperJobAPI, name)
+
+    with SuperJobAPI(api_key="test") as api:
+        assert api._split_query("1", 100, {}, 1000) is None